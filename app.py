@@ -1,7 +1,6 @@
 import streamlit as st
-from utils.transcription import get_transcript
+from utils.transcription import get_transcript, MemoryTranscriptCache
 from utils.summarization import generate_summary
-from utils.report_generator import create_text_report, create_pdf_report
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -17,6 +16,17 @@ st.markdown("""
     This tool runs **100% locally**, using the open-source Ollama framework. Your data never leaves your computer.
 """)
 
+# --- Transcription adapters ---
+@st.cache_resource
+def transcript_cache():
+    """One transcript cache shared by all sessions of this app."""
+    return MemoryTranscriptCache()
+
+def show_transcription_event(event, message):
+    """Surfaces transcription warnings in the UI."""
+    if event == "captions_unavailable":
+        st.warning(message)
+
 # --- Initialize Session State ---
 if 'summary' not in st.session_state:
     st.session_state['summary'] = None
@@ -36,7 +46,11 @@ if analyze_button:
     if st.session_state['video_url']:
         try:
             with st.spinner("Step 1/2: Retrieving and transcribing video... This may take a few minutes."):
-                transcript = get_transcript(st.session_state['video_url'])
+                transcript = get_transcript(
+                    st.session_state['video_url'],
+                    on_event=show_transcription_event,
+                    cache=transcript_cache()
+                )
                 st.session_state['transcript'] = transcript
             
             with st.spinner("Step 2/2: Generating financial summary with local AI..."):
@@ -102,6 +116,9 @@ if st.session_state['summary']:
                 st.markdown("No specific risks mentioned.")
     
     # --- Download Buttons ---
+    # Imported here so the first page render doesn't pay for fpdf
+    from utils.report_generator import create_text_report, create_pdf_report
+
     st.subheader("Download Report")
     dl_col1, dl_col2 = st.columns(2)
     with dl_col1:
@@ -1,35 +1,48 @@
 import os
+import copy
 import requests
 import time
 import json
-import feedparser
-import spacy
-from utils.transcription import get_transcript
 from utils.summarization import generate_summary
-import pandas as pd
+from utils.transcription import get_transcript_segments, extract_video_id, DiskTranscriptCache
+from utils.prefetch import prefetch_captions, WhisperScheduler
+from utils.company_scanner import get_company_scanner
+from utils.dedup import NearDuplicateIndex
+from utils.schemas import load_json_lenient, parse_number
+from utils.llm_backends import get_backend
+from utils import metrics
+from utils.growth_extraction import extract_growth_mentions, reconcile_growth_mentions
+from utils import growth_store
+from utils.sharding import ShardState, load_channel_ids, default_worker_id, file_lock, SHARD_STATE_PATH
 import re
-from thefuzz import process,fuzz
 from dotenv import load_dotenv
 load_dotenv()
 
+# Heavy dependencies (pandas, feedparser, thefuzz, and whisper/yt_dlp inside
+# utils.transcription) are imported inside the functions that use them so
+# that poller restarts and CLI one-offs start quickly.
+
 SIMILARITY_THRESHOLD = 80
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+METRICS_PORT = os.getenv("METRICS_PORT")  # serve /metrics and /metrics.json if set
+METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH")  # dump a JSON snapshot after every poll if set
+TRANSCRIPT_COMPANY_LIMIT = 8  # companies taken from the transcript scan per video (panels name 6+)
+TRANSCRIPT_CACHE = DiskTranscriptCache(os.getenv("TRANSCRIPT_CACHE_DIR", ".transcript_cache"))
 
-# 👇 Add your YouTube channel IDs here
-CHANNEL_IDS = [
-    "UC3uJIdRFTGgLWrUziaHbzrg",
-    "UCkXopQ3ubd-rnXnStZqCl2w",
-    "UCQIycDaLsBpMKjOCeaKUYVg",
-    "UCI_mwTKUhicNzFrhm33MzBQ",
-    "UCmRbHAgG2k2vDUvb3xsEunQ",
-]
+# 👇 YouTube channel IDs to poll live in channels.json (or $CHANNELS_CONFIG)
+POLL_INTERVAL = 600  # seconds between polls
 
 VISITED_LOG = "visited_videos.json"
+# Reference data ships with the code; resolve it independently of the working directory
+COMPANY_MAPPING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "accord_bse_mapping.xlsx")
 
 def fetch_latest_videos(channel_id, max_videos=3):
+    import feedparser
+
     rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id.strip()}"
-    feed = feedparser.parse(rss_url)
+    with metrics.timed("feed_fetch"):
+        feed = feedparser.parse(rss_url)
     return [(entry.link, entry.title) for entry in feed.entries[:max_videos]]
 
 def send_to_slack(text):
@@ -37,7 +50,8 @@ def send_to_slack(text):
         print("SLACK_WEBHOOK_URL not set")
         return
     payload = {"text": text}
-    requests.post(SLACK_WEBHOOK_URL, json=payload)
+    with metrics.timed("slack"):
+        requests.post(SLACK_WEBHOOK_URL, json=payload)
 
 def load_visited():
     if os.path.exists(VISITED_LOG):
@@ -49,8 +63,10 @@ def save_visited(visited):
     with open(VISITED_LOG, "w") as f:
         json.dump(list(visited), f)
 
-def load_company_data(filepath="accord_bse_mapping.xlsx"):
+def load_company_data(filepath=COMPANY_MAPPING_PATH):
     """Loads the company data from the Excel file."""
+    import pandas as pd
+
     try:
         df = pd.read_excel(filepath)
         print(f"Successfully loaded {filepath}")
@@ -81,19 +97,28 @@ def load_company_data(filepath="accord_bse_mapping.xlsx"):
         print(f"Error loading company data: {e}")
         return {}
 
-COMPANY_DATA = load_company_data()
+_company_data = None
 
-def extract_companies_with_gpt(title: str, api_key=None, model="gpt-5-mini", max_retries=3) -> list[str]:
-    """
-    Uses GPT to extract company names and their common aliases from the title.
-    """
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("OPENAI_API_KEY not set")
-        return []
-    
-    prompt = f"""
+def get_company_data() -> dict:
+    """Returns the company data, loading the Excel mapping on first use."""
+    global _company_data
+    if _company_data is None:
+        _company_data = load_company_data()
+    return _company_data
+
+_dedup_index = None
+
+def get_dedup_index() -> NearDuplicateIndex:
+    """Returns the near-duplicate index of processed videos, loading it on first use."""
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = NearDuplicateIndex()
+    return _dedup_index
+
+TITLE_TRIAGE_SYSTEM_PROMPT = "You are a precise financial analyst. Only identify Indian companies you are confident about. Avoid hallucination."
+
+def build_title_triage_prompt(title: str) -> str:
+    return f"""
 You are a financial analyst tasked with identifying Indian company names from YouTube video titles.
 
 Given this video title: "{title}"
@@ -134,36 +159,42 @@ Format your response as a JSON array of strings.
 Example response: ["Reliance Industries Limited", "Tata Consultancy Services"]
 """
 
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": "You are a precise financial analyst. Only identify Indian companies you are confident about. Avoid hallucination."},
-            {"role": "user", "content": prompt}
-        ],
-    }
 
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            result = response.json()
-            response_content = result["choices"][0]["message"]["content"].strip()
-            
-            # Parse JSON response
-            companies = json.loads(response_content)
-            return companies if isinstance(companies, list) else []
-            
-        except Exception as e:
-            print(f"[GPT] Attempt {attempt + 1} failed: {e}")
-            time.sleep(1)
-    
-    return []
+def parse_title_triage_response(response_content) -> list[str]:
+    """Parses the JSON array of company names returned for a title."""
+    if not response_content:
+        return []
+    try:
+        companies = load_json_lenient(response_content)
+    except json.JSONDecodeError as e:
+        print(f"[LLM] Could not parse title triage response: {e}")
+        return []
+    return [str(c) for c in companies] if isinstance(companies, list) else []
 
+def extract_companies_batch(titles: list[str], api_key=None, model=None, max_retries=3) -> list[list[str]]:
+    """
+    Extracts company names for several titles at once, fanning requests out
+    up to the triage backend's concurrency limit. Results keep input order.
+    """
+    backend = get_backend("triage", api_key=api_key, model=model)
+    messages_list = [
+        [
+            {"role": "system", "content": TITLE_TRIAGE_SYSTEM_PROMPT},
+            {"role": "user", "content": build_title_triage_prompt(title)}
+        ]
+        for title in titles
+    ]
+    with metrics.timed("title_extraction"):
+        responses = backend.chat_batch(messages_list, max_retries=max_retries)
+    return [parse_title_triage_response(r) for r in responses]
+
+def extract_companies_with_gpt(title: str, api_key=None, model=None, max_retries=3) -> list[str]:
+    """
+    Uses the triage LLM backend to extract company names and their common aliases from the title.
+    """
+    return extract_companies_batch([title], api_key=api_key, model=model, max_retries=max_retries)[0]
+
+@metrics.timed("matching")
 def find_companies_in_data(gpt_companies: list[str]) -> list[dict]:
     """
     Matches GPT-extracted company names against the database using a more robust method.
@@ -175,11 +206,13 @@ def find_companies_in_data(gpt_companies: list[str]) -> list[dict]:
     
     This avoids prematurely accepting a high-scoring incorrect match.
     """
+    from thefuzz import process, fuzz
+
     found_companies = []
     
     # --- Pre-normalization setup (run once) ---
     normalized_company_data = {}
-    for original_key, info in COMPANY_DATA.items():
+    for original_key, info in get_company_data().items():
         normalized_key = re.sub(r'\s+', ' ', original_key.lower().strip().rstrip('.')).strip()
         if normalized_key:
             normalized_company_data[normalized_key] = info
@@ -266,30 +299,55 @@ def test_title_extraction(title: str):
     if not companies_info:
         print("No companies matched in database")
 
+def resolve_growth_company(entry_name, companies_info):
+    """
+    Returns the entry of `companies_info` that a summary's company name
+    ("Tata Consultancy Services Limited") refers to, or None. Without a name
+    only a single-company video resolves.
+    """
+    entry_name = (entry_name or "").strip()
+    if not entry_name:
+        return companies_info[0] if len(companies_info) == 1 else None
+    by_isin = {c.get('isin'): c for c in companies_info if c.get('isin')}
+    for match in find_companies_in_data([entry_name]):
+        if match.get('isin') in by_isin:
+            return by_isin[match['isin']]
+    return None
+
 def log_company_growth(summary_data, companies_info, video_url, title):
     """
     Logs one row per company summarizing >30% growth mentions, with timestamped links.
+    Every numeric mention is also recorded in the growth store for querying.
     """
+    import pandas as pd
+
     growth_mentions = summary_data.get("growth_mentions", [])
     summary = summary_data.get("summary", {})
 
     if not growth_mentions:
         return
 
+    # The growth store is keyed by ISIN, so only record mentions whose
+    # company resolves to one of the video's matched companies
+    company_info = resolve_growth_company(summary_data.get("company_name", ""), companies_info)
+    if company_info:
+        try:
+            growth_store.record_growth(company_info, growth_mentions, video_url, title)
+        except Exception as e:
+            print(f"⚠️ Error recording growth history: {e}")
+    else:
+        print(f"⚠️ Growth mentions not recorded: '{summary_data.get('company_name', '')}' matched no company of this video")
+    company_info = company_info or (companies_info[0] if companies_info else None)
+
     metric_summaries = []
     context_snippets = []
     timestamp_links = []
 
-    video_id = None
-    try:
-        from utils.transcription import extract_video_id
-        video_id = extract_video_id(video_url)
-    except Exception:
-        pass
+    video_id = extract_video_id(video_url)
 
     for g in growth_mentions:
-        val = g.get("growth_value", 0)
-        if val <= 30:
+        val = parse_number(g.get("growth_value"))
+        if val is None or val <= 30:
             continue
 
         metric = g.get("metric", "Unknown")
@@ -308,25 +366,16 @@ def log_company_growth(summary_data, companies_info, video_url, title):
         return
 
     company_name = (
-        companies_info[0].get('company_name', '') if companies_info
+        company_info.get('company_name', '') if company_info
         else summary.get('company_name', '')
     )
     isin = (
-        companies_info[0].get('isin', '') if companies_info
+        company_info.get('isin', '') if company_info
         else ''
     )
 
     log_path = "growth_mentions_llm.xlsx"
 
-    if not os.path.exists(log_path):
-        df = pd.DataFrame(columns=[
-            "Company Name", "ISIN", "Metrics With >30% Growth",
-            "Growth Details", "Timestamped Links", "Video URL", "Title"
-        ])
-        df.to_excel(log_path, index=False)
-
-    df_existing = pd.read_excel(log_path)
-
     new_entry = {
         "Company Name": company_name,
         "ISIN": isin,
@@ -337,17 +386,29 @@ def log_company_growth(summary_data, companies_info, video_url, title):
         "Title": title
     }
 
-    df_existing = pd.concat([df_existing, pd.DataFrame([new_entry])], ignore_index=True)
-    df_existing.to_excel(log_path, index=False)
+    # Sharded workers on one host append to the same workbook: serialize the
+    # read/concat/write and replace the file atomically so no row is lost
+    with file_lock(log_path):
+        if os.path.exists(log_path):
+            df_existing = pd.read_excel(log_path)
+        else:
+            df_existing = pd.DataFrame(columns=list(new_entry))
+
+        df_existing = pd.concat([df_existing, pd.DataFrame([new_entry])], ignore_index=True)
+        tmp_path = f"{os.path.splitext(log_path)[0]}.{os.getpid()}.tmp.xlsx"
+        df_existing.to_excel(tmp_path, index=False)
+        os.replace(tmp_path, log_path)
 
     print(f"✅ Logged growth summary for {company_name}: {len(metric_summaries)} metrics >30%")
 
 
-def format_summary_for_slack(url, summary, channel_id, title, companies_info):
+def format_summary_for_slack(url, summary, channel_id, title, companies_info, duplicate_of=None):
     # We expect `summary` to be a list of objects with keys: company_name, speaker, note
     lines = []
     lines.append(f"*Summary for channel:* `{channel_id}`\n<{url}>")
     lines.append(f"*Video Title:* {title}")
+    if duplicate_of:
+        lines.append(f"_Near-duplicate of <{duplicate_of}>, summary reused._")
 
     if isinstance(summary, list) and summary:
         # Match summary entries to companies_info by company_name (fuzzy if needed)
@@ -377,52 +438,258 @@ def format_summary_for_slack(url, summary, channel_id, title, companies_info):
 
     return "\n".join(lines)
 
-def main():
-    visited_videos = load_visited()
-    while True:
-        for channel_id in CHANNEL_IDS:
-            videos = fetch_latest_videos(channel_id)
-            for url, title in videos:
-                if url in visited_videos:
-                    continue
+def fetch_new_videos(visited_videos, channel_ids):
+    """Returns (channel_id, url, title) for unvisited videos across `channel_ids`."""
+    new_videos = []
+    for channel_id in channel_ids:
+        for url, title in fetch_latest_videos(channel_id):
+            if url not in visited_videos:
+                new_videos.append((channel_id, url, title))
+    return new_videos
 
-                # Use GPT to extract company names
-                gpt_companies = extract_companies_with_gpt(title)
-                if not gpt_companies:
-                    print(f"Skipping (no companies found by GPT): {title}")
-                    continue
-                
-                # Find companies in our Excel data
-                companies_info = find_companies_in_data(gpt_companies)
-                if not companies_info:
-                    print(f"Skipping (no companies matched in database): {title}")
-                    continue
+def process_video(channel_id, url, title, gpt_companies, segments=None, whisper_scheduler=None) -> bool:
+    """
+    Matches, transcribes, summarizes, logs and posts one video.
+    Companies come from the title triage plus a dictionary scan of the
+    transcript, so videos with no company in the title are still covered
+    when captions are available.
+    `segments` may be passed to skip transcript retrieval. If a
+    `whisper_scheduler` is given, a video without a cached transcript is
+    queued for background Whisper transcription instead of blocking.
+    Returns True if the video was fully processed.
+    """
+    video_id = extract_video_id(url)
 
-                company_names = [info['company_name'] for info in companies_info]
-                print(f"Processing: {title} ({url}) from channel {channel_id}, Companies: {company_names}")
-                
-                try:
-                    transcript = get_transcript(url)
-                    summary = generate_summary(transcript)
-                    
-                    # Log all >30% growth mentions (if any)
-                    try:
-                        # Loop through all company summaries
-                        for entry in summary:
-                            if "growth_mentions" in entry and entry["growth_mentions"]:
-                                log_company_growth(entry, companies_info, url, title)
-                    except Exception as e:
-                        print(f"⚠️ Error logging growth data: {e}")
-
-                    summary_text = format_summary_for_slack(url, summary, channel_id, title, companies_info)
-                    send_to_slack(summary_text)
-                    visited_videos.add(url)
-                except Exception as e:
-                    print(f"Error processing {url}: {e}")
+    # Find companies in our Excel data
+    companies_info = find_companies_in_data(gpt_companies) if gpt_companies else []
+
+    try:
+        if segments is None:
+            segments = TRANSCRIPT_CACHE.get(video_id)
+            fetching = segments is None and whisper_scheduler is None and companies_info
+            if not fetching:
+                # get_transcript_segments records its own lookup on the fetch path
+                metrics.record_cache("transcript", segments is not None)
+        if segments is None and not companies_info:
+            # Nothing in the title and no cheap transcript to scan: not worth Whisper
+            print(f"Skipping (no companies in title, no captions to scan): {title}")
+            return False
+        if segments is None and whisper_scheduler is not None:
+            whisper_scheduler.submit(url)
+            print(f"Queued for Whisper transcription: {title}")
+            return False
+        if segments is None:
+            segments = get_transcript_segments(url, cache=TRANSCRIPT_CACHE)
+        transcript = " ".join(seg['text'] for seg in segments or [])
+
+        # Companies discussed in the transcript but not named in the title
+        with metrics.timed("transcript_company_scan"):
+            transcript_companies = get_company_scanner().top_companies(transcript, limit=TRANSCRIPT_COMPANY_LIMIT)
+        if transcript_companies:
+            known_isins = {c.get('isin') for c in companies_info}
+            for company in find_companies_in_data(transcript_companies):
+                if company.get('isin') not in known_isins:
+                    companies_info.append(company)
+                    known_isins.add(company.get('isin'))
+
+        if not companies_info:
+            print(f"Skipping (no companies matched in database): {title}")
+            return False
+
+        company_names = [info['company_name'] for info in companies_info]
+        print(f"Processing: {title} ({url}) from channel {channel_id}, Companies: {company_names}")
+
+        # Cross-posted or re-uploaded videos reuse the existing summary. Only
+        # the transcript decides: titles of different quarters' calls differ
+        # by a single token.
+        duplicate = get_dedup_index().find(transcript, exclude=video_id)
+
+        if duplicate:
+            _, duplicate_entry, similarity = duplicate
+            print(f"Near-duplicate (similarity {similarity:.2f}) of {duplicate_entry['url']}, reusing its summary")
+            metrics.inc("dedup_hits_total")
+            summary = copy.deepcopy(duplicate_entry["summary"])
+        else:
+            summary = generate_summary(transcript)
+            get_dedup_index().add(video_id, url, title, transcript, summary)
+            get_dedup_index().save()
+
+            # Deterministic growth extraction with exact timestamps,
+            # used to verify the LLM's growth_mentions
+            local_growth = extract_growth_mentions(segments, min_growth=30)
+
+            # Log all >30% growth mentions (if any); duplicates were logged with the original
+            try:
+                # Loop through all company summaries
+                for entry in summary:
+                    if "growth_mentions" in entry and entry["growth_mentions"]:
+                        entry["growth_mentions"] = reconcile_growth_mentions(entry["growth_mentions"], local_growth)
+                        log_company_growth(entry, companies_info, url, title)
+
+                # Single-company video the LLM found no growth in: log the local findings
+                if len(companies_info) == 1 and local_growth and not any(e.get("growth_mentions") for e in summary):
+                    log_company_growth({"growth_mentions": local_growth}, companies_info, url, title)
+            except Exception as e:
+                print(f"⚠️ Error logging growth data: {e}")
+
+        duplicate_of = duplicate[1]['url'] if duplicate else None
+        summary_text = format_summary_for_slack(url, summary, channel_id, title, companies_info, duplicate_of=duplicate_of)
+        send_to_slack(summary_text)
+        metrics.inc("videos_processed_total")
+        return True
+    except Exception as e:
+        print(f"Error processing {url}: {e}")
+        metrics.inc("videos_failed_total")
+        return False
+
+def main(worker_id=None, state_path=None, metrics_port=METRICS_PORT, metrics_json_path=METRICS_JSON_PATH):
+    """
+    Polls the configured channels forever. With a `state_path`, runs as one
+    worker of a sharded deployment: channels are split between live workers
+    by consistent hashing and each video is leased in the shared state store,
+    so several worker processes never process the same video.
+    """
+    if metrics_port:
+        metrics.start_metrics_server(int(metrics_port))
+        print(f"Serving metrics on :{metrics_port}/metrics")
+
+    # Refresh ISIN -> industry / market cap rows used by growth history queries
+    try:
+        growth_store.sync_companies(get_company_data().values())
+    except Exception as e:
+        print(f"⚠️ Could not sync companies into the growth store: {e}")
+
+    channel_ids = load_channel_ids()
+    visited_videos = load_visited()
+    state = None
+    if state_path:
+        worker_id = worker_id or default_worker_id()
+        state = ShardState(state_path)
+        state.import_visited(visited_videos)
+        print(f"Worker {worker_id} using shared state {state_path}")
+
+    def claim(url):
+        # Single-process mode owns every video
+        return state is None or state.try_lease(url, worker_id)
+
+    def finish(url, processed):
+        if processed:
+            visited_videos.add(url)
+            if state:
+                state.mark_done(url, worker_id)
+        elif state and not whisper_scheduler.is_pending(url):
+            state.release(url, worker_id)
+
+    whisper_scheduler = WhisperScheduler(TRANSCRIPT_CACHE.directory)
+    triaged = {}  # url -> companies from title triage, so retries don't repeat the LLM call
+    awaiting_whisper = {}  # url -> (channel_id, title)
+    try:
+        while True:
+            if state:
+                state.heartbeat(worker_id)
+                my_channels = state.assigned_channels(worker_id, channel_ids)
+                print(f"Worker {worker_id} polling {len(my_channels)}/{len(channel_ids)} channels")
+            else:
+                my_channels = channel_ids
+            new_videos = fetch_new_videos(visited_videos, my_channels)
+            if state:
+                visited_videos |= state.done_urls(url for _, url, _ in new_videos)
+                new_videos = [v for v in new_videos if v[1] not in visited_videos]
+
+            # Fetch captions for every new video up front so they don't wait
+            # behind title triage; videos without captions go to Whisper later
+            prefetch_captions([url for _, url, _ in new_videos], TRANSCRIPT_CACHE)
+
+            # Use the triage LLM to extract company names for all new titles at once
+            untriaged = [(url, title) for _, url, title in new_videos if url not in triaged]
+            for (url, _), companies in zip(untriaged, extract_companies_batch([title for _, title in untriaged])):
+                triaged[url] = companies
+
+            # Videos whose Whisper transcription finished since the last poll
+            for url, error in whisper_scheduler.pop_finished().items():
+                channel_id, title = awaiting_whisper.pop(url, (None, None))
+                if error:
+                    print(f"Error transcribing {url}: {error}")
+                    finish(url, False)
+                elif channel_id and url not in visited_videos and claim(url):
+                    finish(url, process_video(channel_id, url, title, triaged[url], whisper_scheduler=whisper_scheduler))
+
+            for channel_id, url, title in new_videos:
+                gpt_companies = triaged[url]
+                # Videos with no companies in the title are still scanned via
+                # their transcript (panel discussions, sector outlooks)
+                if url in visited_videos or whisper_scheduler.is_pending(url):
+                    if state and url in awaiting_whisper:
+                        claim(url)  # renew the lease while Whisper runs
                     continue
-                    
-        save_visited(visited_videos)
-        time.sleep(600)  # Wait 10 minutes before checking again
+                if not claim(url):
+                    continue  # another worker has it
+
+                processed = process_video(channel_id, url, title, gpt_companies, whisper_scheduler=whisper_scheduler)
+                if not processed and whisper_scheduler.is_pending(url):
+                    awaiting_whisper[url] = (channel_id, title)
+                finish(url, processed)
+                if state:
+                    state.heartbeat(worker_id)
+
+            # Triage results are only needed until a video is done
+            for url in visited_videos.intersection(triaged):
+                del triaged[url]
+
+            if state is None:
+                save_visited(visited_videos)
+            if metrics_json_path:
+                metrics.dump_json(metrics_json_path)
+            time.sleep(POLL_INTERVAL)  # Wait 10 minutes before checking again
+    finally:
+        whisper_scheduler.shutdown()
+        if state:
+            state.remove_worker(worker_id)
+
+
+def run_workers(count, state_path):
+    """Runs `count` sharded worker processes on this host until interrupted."""
+    import socket
+    import multiprocessing
+
+    host = socket.gethostname()
+    workers = []
+    for i in range(count):
+        port = int(METRICS_PORT) + i if METRICS_PORT else None
+        json_path = None
+        if METRICS_JSON_PATH:
+            root, ext = os.path.splitext(METRICS_JSON_PATH)
+            json_path = f"{root}.{i}{ext}"
+        process = multiprocessing.Process(
+            target=main, args=(f"{host}-{i}", state_path, port, json_path), name=f"poller-{i}",
+        )
+        process.start()
+        workers.append(process)
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
 
 if __name__ == "__main__":
-    main()        
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Poll YouTube channels and post company summaries to Slack.")
+    parser.add_argument("--sharded", action="store_true",
+                        help="run as one worker of a sharded deployment on this host")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="run N sharded worker processes on this host")
+    parser.add_argument("--worker-id", help="stable worker name (default: <hostname>-<pid>)")
+    parser.add_argument("--state", default=SHARD_STATE_PATH,
+                        help="SQLite state store shared by the workers on this host "
+                             "(network filesystems are not supported)")
+    args = parser.parse_args()
+
+    if args.workers > 0:
+        run_workers(args.workers, args.state)
+    elif args.sharded:
+        main(args.worker_id, args.state)
+    else:
+        main()
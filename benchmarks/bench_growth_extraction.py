@@ -0,0 +1,57 @@
+"""
+Benchmarks the local growth extraction engine on the sample transcripts and
+checks the regression cases in growth_cases.json.
+
+Usage: python -m benchmarks.bench_growth_extraction
+"""
+import os
+import json
+import time
+from utils.growth_extraction import extract_growth_mentions
+from benchmarks.fixtures import load_transcripts
+
+GROWTH_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "growth_cases.json")
+
+
+def check_cases(path=GROWTH_CASES) -> list[str]:
+    """Returns a description of every case whose (metric, value) records differ from the expected ones."""
+    with open(path, "r") as f:
+        cases = json.load(f)
+    failures = []
+    for case in cases:
+        found = [[m["metric"], m["growth_value"]] for m in extract_growth_mentions(case["text"])]
+        if found != case["expected"]:
+            failures.append(f"{case['text']!r}: expected {case['expected']}, got {found}")
+    return failures
+
+
+def scale_transcript(segments, target_words=10000):
+    """Repeats a transcript (shifting timestamps) until it reaches `target_words`."""
+    words = sum(len(seg["text"].split()) for seg in segments)
+    repeats = max(1, target_words // max(words, 1))
+    duration = segments[-1]["start"] + segments[-1].get("duration", 0)
+    return [
+        {**seg, "start": seg["start"] + i * duration}
+        for i in range(repeats)
+        for seg in segments
+    ]
+
+
+def bench(segments, iterations=20):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        mentions = extract_growth_mentions(segments)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+    return elapsed_ms, len(mentions)
+
+
+if __name__ == "__main__":
+    failures = check_cases()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(failures)} growth case failure(s)\n")
+    for name, segments in load_transcripts().items():
+        for label, data in (("sample", segments), ("10k words", scale_transcript(segments))):
+            ms, found = bench(data)
+            words = sum(len(seg["text"].split()) for seg in data)
+            print(f"{name:<30} {label:<10} {words:>6} words  {ms:8.2f} ms  {found:>4} mentions")
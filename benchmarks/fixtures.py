@@ -0,0 +1,162 @@
+"""
+Shared fixtures for the benchmarks: the real company reference data,
+synthetic title corpora, recorded transcripts and a local stub of the
+OpenAI chat completions API.
+"""
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPANY_JSON = os.path.join(REPO_ROOT, "company_data.json")
+TRANSCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts")
+
+TITLE_TEMPLATES = [
+    "{name} Q2 Results: Revenue Up, Margins Under Pressure | Management Interview",
+    "{name} CEO On Growth Outlook & Capex Plans",
+    "Why {name} Shares Jumped 8% Today | Market Minutes",
+    "{name} vs {other}: Which Stock To Buy?",
+    "Stock Market LIVE: Nifty, Sensex Today; Focus On {name}",
+    "Earnings Call Highlights: {name}",
+    "Sector Outlook: Banks, IT And Auto In FY26",
+]
+
+SUFFIX_VARIANTS = [" Ltd.", " Limited", " Ltd", "", " India"]
+
+
+def load_company_names() -> list[str]:
+    """Returns the display names from company_data.json."""
+    with open(COMPANY_JSON, "r") as f:
+        data = json.load(f)
+    return list(data["name_map"].values())
+
+
+def synthetic_company_queries(n=200, seed=7) -> list[str]:
+    """Company names as an LLM would return them: suffix variations and casing noise."""
+    rng = random.Random(seed)
+    names = load_company_names()
+    queries = []
+    for _ in range(n):
+        name = rng.choice(names)
+        base = name.replace(" Ltd.", "").replace(" Ltd", "")
+        variant = base + rng.choice(SUFFIX_VARIANTS)
+        queries.append(variant.upper() if rng.random() < 0.1 else variant)
+    return queries
+
+
+def synthetic_titles(n=200, seed=7) -> list[str]:
+    rng = random.Random(seed)
+    names = load_company_names()
+    return [
+        rng.choice(TITLE_TEMPLATES).format(name=rng.choice(names).replace(" Ltd.", ""), other=rng.choice(names).replace(" Ltd.", ""))
+        for _ in range(n)
+    ]
+
+
+def load_transcripts() -> dict[str, list[dict]]:
+    transcripts = {}
+    for filename in sorted(os.listdir(TRANSCRIPTS_DIR)):
+        if filename.endswith(".json"):
+            with open(os.path.join(TRANSCRIPTS_DIR, filename), "r") as f:
+                transcripts[filename[:-5]] = json.load(f)
+    return transcripts
+
+
+def noisy_captions(segments, seed=7) -> list[dict]:
+    """
+    Adds YouTube auto-caption noise to a clean transcript: fillers, stuttered
+    words and [Music] markers at roughly the rate seen in live captions.
+    """
+    rng = random.Random(seed)
+    noisy = []
+    for seg in segments:
+        words = []
+        for word in seg["text"].split():
+            roll = rng.random()
+            if roll < 0.08:
+                words.append(rng.choice(["uh", "um", "you know", "I mean", "basically"]))
+            elif roll < 0.12:
+                words.append(word)  # stutter: the word is repeated below
+            words.append(word)
+        if rng.random() < 0.05:
+            words.insert(0, "[Music]")
+        noisy.append({**seg, "text": " ".join(words)})
+    return noisy
+
+
+def sample_summary(company_name="Persistent Systems Ltd.") -> list[dict]:
+    return [{
+        "company_name": company_name,
+        "speaker": "Sandeep Kalra / CEO",
+        "note": "Management expects deal momentum in generative AI to sustain growth.",
+        "growth_mentions": [
+            {"metric": "EBITDA", "growth_value": 32, "context": "EBITDA came in at 58 million dollars, up 32 percent YoY.",
+             "timestamp_seconds": None, "type": "YoY", "reliability": "High"},
+            {"metric": "Order Book", "growth_value": 41, "context": "The order book jumped 41 percent over last year.",
+             "timestamp_seconds": None, "type": "YoY", "reliability": "Medium"},
+        ],
+    }]
+
+
+def sample_report() -> dict:
+    """A report-shaped summary for create_text_report / create_pdf_report."""
+    return {
+        "executive_summary": "Revenue grew 18.9% YoY with broad-based growth across verticals. " * 5,
+        "key_financials": [
+            {"metric": "Revenue", "value": "$345M", "commentary": "Up 18.9% YoY, 5.4% QoQ"},
+            {"metric": "EBITDA", "value": "$58M", "commentary": "Up 32% YoY"},
+            {"metric": "PAT Margin", "value": "14.2%", "commentary": "Stable"},
+        ],
+        "strategic_initiatives": ["Generative AI practice expansion", "Healthcare vertical ramp-up"] * 3,
+        "outlook_and_guidance": "Targeting $2B revenue by FY27 with 200-250 bps margin improvement.",
+        "key_risks_mentioned": ["Client concentration", "Currency volatility", "Attrition"],
+    }
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    company_names = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        messages = body.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+
+        if any(m["role"] == "system" for m in messages):
+            # Title triage: echo back any known company name found in the title
+            title = prompt.split('Given this video title: "', 1)[-1].split('"', 1)[0].lower()
+            found = [n for n in self.company_names if n.lower().replace(" ltd.", "") in title][:2]
+            content = json.dumps(found)
+        else:
+            content = json.dumps({"companies": sample_summary()})
+
+        time.sleep(self.latency)
+        payload = json.dumps({
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_openai_server(latency=0.0, port=0) -> ThreadingHTTPServer:
+    """
+    Starts a local OpenAI-compatible server in a daemon thread and returns it.
+    Point OPENAI_BASE_URL at f"http://127.0.0.1:{server.server_port}/v1".
+    """
+    handler = type("StubOpenAIHandler", (_StubOpenAIHandler,), {
+        "latency": latency,
+        "company_names": load_company_names(),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
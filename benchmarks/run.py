@@ -0,0 +1,408 @@
+"""
+Benchmark suite for the matching, transcription, summarization and
+reporting hot paths.
+
+Usage:
+    python -m benchmarks.run                      # run all, compare with the previous run
+    python -m benchmarks.run matching pdf_report  # run selected benchmarks
+    python -m benchmarks.run --baseline benchmarks/results/<file>.json
+
+Each run is stored as benchmarks/results/<timestamp>_<commit>.json. Any
+benchmark whose median is more than --threshold slower than the baseline
+is reported as a regression (and the exit code is 1).
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(fn, repeat=5, warmup=1) -> dict:
+    """Times `fn()` `repeat` times (after `warmup` untimed calls), silencing its prints."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.mean(timings),
+        "repeat": repeat,
+    }
+
+
+# --- Benchmarks -------------------------------------------------------------
+# Each returns {case_name: measurement}; a measurement may add throughput fields.
+
+# Entry-point modules and the import-time budget (seconds) each must stay under
+IMPORT_BUDGETS = {
+    "auto": 1.0,
+    "results": 1.0,
+    "utils.summarization": 0.5,
+    "utils.growth_extraction": 0.5,
+}
+# Modules that must only be loaded on the code path that needs them
+HEAVY_MODULES = ["torch", "whisper", "yt_dlp", "streamlit", "spacy", "pandas", "openpyxl", "feedparser", "thefuzz", "fpdf"]
+
+
+def bench_import_time():
+    """Cold-imports each entry point in a fresh interpreter and checks the budget."""
+    results = {}
+    probe = (
+        "import sys, time, json; start = time.perf_counter(); import {module}; "
+        "elapsed = time.perf_counter() - start; "
+        "print(json.dumps([elapsed, sorted(m for m in {heavy!r} if m in sys.modules)]))"
+    )
+    for module, budget in IMPORT_BUDGETS.items():
+        timings, loaded = [], []
+        for _ in range(3):
+            out = subprocess.check_output(
+                [sys.executable, "-c", probe.format(module=module, heavy=HEAVY_MODULES)],
+                cwd=fixtures.REPO_ROOT, text=True,
+            )
+            elapsed, loaded = json.loads(out.strip().splitlines()[-1])
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        results[f"import[{module}]"] = {
+            "min_s": min(timings), "median_s": median, "mean_s": statistics.mean(timings),
+            "repeat": len(timings), "budget_s": budget, "over_budget": median > budget,
+            "heavy_modules_loaded": loaded,
+        }
+    return results
+
+
+def bench_load_company_data():
+    import auto
+    return {"load_company_data": measure(auto.load_company_data, repeat=3, warmup=0)}
+
+
+def bench_matching():
+    import auto
+    results = {}
+    for n in (10, 100):
+        queries = fixtures.synthetic_company_queries(n)
+        m = measure(lambda: auto.find_companies_in_data(queries), repeat=3)
+        m["queries_per_s"] = n / m["median_s"]
+        results[f"find_companies_in_data[{n}]"] = m
+    return results
+
+
+def bench_growth_log_append():
+    import auto
+    import pandas as pd
+
+    results = {}
+    entry = fixtures.sample_summary()[0]
+    companies_info = [{"company_name": entry["company_name"], "isin": "INE262H01021"}]
+    row = {
+        "Company Name": entry["company_name"], "ISIN": "INE262H01021",
+        "Metrics With >30% Growth": "EBITDA (32.0%)", "Growth Details": "context",
+        "Timestamped Links": "https://www.youtube.com/watch?v=x&t=34s",
+        "Video URL": "https://www.youtube.com/watch?v=x", "Title": "title",
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for rows in (10, 1000, 5000):
+                def append():
+                    # Reset to `rows` rows so every timed call sees the same log size
+                    pd.DataFrame([row] * rows).to_excel("growth_mentions_llm.xlsx", index=False)
+                    start = time.perf_counter()
+                    auto.log_company_growth(entry, companies_info, "https://www.youtube.com/watch?v=x", "title")
+                    return time.perf_counter() - start
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    timings = [append() for _ in range(3)]
+                results[f"log_company_growth[{rows} rows]"] = {
+                    "min_s": min(timings), "median_s": statistics.median(timings),
+                    "mean_s": statistics.mean(timings), "repeat": len(timings),
+                }
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def bench_pdf_report():
+    from utils.report_generator import create_pdf_report, create_text_report
+    report = fixtures.sample_report()
+    return {
+        "create_pdf_report": measure(lambda: create_pdf_report(report), repeat=10),
+        "create_text_report": measure(lambda: create_text_report(report), repeat=10),
+    }
+
+
+def bench_growth_extraction():
+    from utils.growth_extraction import extract_growth_mentions
+    from benchmarks.bench_growth_extraction import scale_transcript, check_cases
+    failures = check_cases()
+    assert not failures, "growth extraction regressions:\n" + "\n".join(failures)
+    results = {}
+    for name, segments in fixtures.load_transcripts().items():
+        scaled = scale_transcript(segments)
+        results[f"extract_growth_mentions[{name},10k words]"] = measure(lambda: extract_growth_mentions(scaled), repeat=10)
+    return results
+
+
+def bench_transcript_compaction():
+    """Compaction time and input tokens saved on noisy 10k-word caption transcripts."""
+    from utils.transcript_compaction import compact_transcript, compaction_report
+    from benchmarks.bench_growth_extraction import scale_transcript
+    results = {}
+    for name, segments in fixtures.load_transcripts().items():
+        text = " ".join(seg["text"] for seg in fixtures.noisy_captions(scale_transcript(segments)))
+        for window in (0, 10):
+            m = measure(lambda: compact_transcript(text, numeric_window=window), repeat=10)
+            report = compaction_report(text, compact_transcript(text, numeric_window=window))
+            m["tokens_before"] = report["tokens_before"]
+            m["tokens_after"] = report["tokens_after"]
+            m["tokens_saved_pct"] = report["saved_pct"]
+            label = f"numeric window {window}" if window else "normalize only"
+            results[f"compact_transcript[{name},{label}]"] = m
+    return results
+
+
+COMPANY_CASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_cases.json")
+TRANSCRIPT_COMPANY_LIMIT = 8  # as in auto.py
+
+
+def check_company_cases(scanner, path=COMPANY_CASES) -> list[str]:
+    """Returns a description of every case whose top_companies differ from the expected ones."""
+    with open(path, "r") as f:
+        cases = json.load(f)
+    transcripts = fixtures.load_transcripts()
+    failures = []
+    for case in cases:
+        text = case.get("text") or " ".join(seg["text"] for seg in transcripts[case["transcript"]])
+        found = scanner.top_companies(text, limit=TRANSCRIPT_COMPANY_LIMIT)
+        if found != case["expected"]:
+            failures.append(f"{case.get('transcript') or case['text'][:40]!r}: expected {case['expected']}, got {found}")
+    return failures
+
+
+def bench_company_scan():
+    from utils.company_scanner import CompanyScanner, load_reference_companies
+    from benchmarks.bench_growth_extraction import scale_transcript
+    companies = load_reference_companies(os.path.join(fixtures.REPO_ROOT, "comp.csv"))
+    failures = check_company_cases(CompanyScanner(companies))
+    assert not failures, "company scan regressions:\n" + "\n".join(failures)
+    results = {"CompanyScanner build": measure(lambda: CompanyScanner(companies), repeat=3, warmup=0)}
+    scanner = CompanyScanner(companies)
+    for name, segments in fixtures.load_transcripts().items():
+        text = " ".join(seg["text"] for seg in scale_transcript(segments))
+        results[f"CompanyScanner.scan[{name},10k words]"] = measure(lambda: scanner.scan(text), repeat=10)
+    return results
+
+
+def bench_pipeline():
+    """
+    Title triage -> matching -> summary -> growth logging -> Slack formatting
+    against the stub API. The recorded transcripts repeat across the 20
+    videos, so most of them take the near-duplicate (summary reuse) path.
+    """
+    import auto
+    titles = fixtures.synthetic_titles(20)
+    transcripts = list(fixtures.load_transcripts().values())
+
+    def run():
+        auto._dedup_index = None
+        if os.path.exists("dedup_index.json"):
+            os.remove("dedup_index.json")
+        triage = auto.extract_companies_batch(titles)
+        for i, (title, companies) in enumerate(zip(titles, triage)):
+            if companies:
+                url = f"https://www.youtube.com/watch?v=bench{i}"
+                processed = auto.process_video("bench", url, title, companies,
+                                               segments=transcripts[i % len(transcripts)])
+                assert processed, f"process_video failed for {url} ({title!r})"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            m = measure(run, repeat=3)
+        finally:
+            os.chdir(cwd)
+    m["videos_per_s"] = len(titles) / m["median_s"]
+    return {"pipeline[20 videos]": m}
+
+
+def bench_dedup():
+    import random
+    from utils.dedup import NearDuplicateIndex, transcript_signature
+
+    rng = random.Random(1)
+    vocab = [f"word{i}" for i in range(3000)]
+    corpus = [" ".join(rng.choice(vocab) for _ in range(10000)) for _ in range(50)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, "dedup_index.json"))
+        for i, text in enumerate(corpus):
+            index.add(f"v{i}", f"https://www.youtube.com/watch?v=v{i}", f"title {i}", text, [])
+        query = corpus[25]
+        return {
+            "transcript_signature[10k words]": measure(lambda: transcript_signature(query), repeat=10),
+            "NearDuplicateIndex.find[50 indexed]": measure(lambda: index.find(query), repeat=10),
+        }
+
+
+def bench_growth_store():
+    """Seeds a store with 100k growth records and times the dashboard-style query."""
+    import random
+    from utils import growth_store
+    from utils.company_scanner import load_reference_companies
+
+    rng = random.Random(1)
+    reference = load_reference_companies(os.path.join(fixtures.REPO_ROOT, "comp.csv"))[:500]
+    companies = [{**c, "isin": f"INE{i:09d}"} for i, c in enumerate(reference)]
+    metrics_ = ["Revenue", "PAT", "EBITDA", "EBITDA Margin", "Loan Book", "Deposits"]
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "growth_history.db")
+        growth_store.sync_companies(companies, path=path)
+        with contextlib.closing(growth_store.connect(path)) as conn, conn:
+            conn.executemany(
+                "INSERT INTO growth (isin, metric, value, period, recorded_at) VALUES (?, ?, ?, 'YoY', ?)",
+                [(rng.choice(companies)["isin"], rng.choice(metrics_), rng.uniform(-20, 80),
+                  now - rng.uniform(0, 365 * 86400)) for _ in range(100000)],
+            )
+        return {
+            "query_growth[revenue>30, Bank - Private, 30d]": measure(
+                lambda: growth_store.query_growth("Revenue", 30, "Bank - Private", 30, path=path), repeat=20),
+            "query_growth[revenue>30, 30d]": measure(
+                lambda: growth_store.query_growth("Revenue", 30, days=30, path=path), repeat=20),
+        }
+
+
+BENCHMARKS = {
+    "import_time": bench_import_time,
+    "load_company_data": bench_load_company_data,
+    "matching": bench_matching,
+    "growth_log_append": bench_growth_log_append,
+    "pdf_report": bench_pdf_report,
+    "growth_extraction": bench_growth_extraction,
+    "company_scan": bench_company_scan,
+    "transcript_compaction": bench_transcript_compaction,
+    "dedup": bench_dedup,
+    "growth_store": bench_growth_store,
+    "pipeline": bench_pipeline,
+}
+
+
+# --- Result storage and comparison -----------------------------------------
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=fixtures.REPO_ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def latest_result_file():
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    return files[-1] if files else None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for case, m in results.items():
+        old = baseline.get("results", {}).get(case)
+        if not old:
+            continue
+        ratio = m["median_s"] / old["median_s"] if old["median_s"] else 1.0
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  <-- REGRESSION"
+            regressions.append(case)
+        print(f"  {case:<55} {old['median_s'] * 1000:10.2f} ms -> {m['median_s'] * 1000:10.2f} ms  ({ratio:5.2f}x){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--baseline", help="results file to compare against (default: most recent run)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="seconds of latency added by the stub OpenAI server")
+    parser.add_argument("--no-save", action="store_true", help="do not store this run")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # The LLM backends read their endpoint at import time, so the stub must be
+    # up and configured before anything imports auto / utils.llm_backends.
+    server = fixtures.start_stub_openai_server(latency=args.stub_latency)
+    os.environ.update({
+        "LLM_BACKEND": "openai",
+        "TRIAGE_LLM_BACKEND": "",
+        "SUMMARY_LLM_BACKEND": "",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{server.server_port}/v1",
+        "OPENAI_API_KEY": "benchmark",
+        "SLACK_WEBHOOK_URL": "",
+    })
+    sys.path.insert(0, fixtures.REPO_ROOT)
+
+    baseline_path = args.baseline or latest_result_file()
+    results = {}
+    failures = {}
+    regressions = []
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"[{name}]")
+        try:
+            cases = BENCHMARKS[name]()
+        except Exception as e:
+            # Keep going so one broken benchmark doesn't discard the others
+            failures[name] = f"{type(e).__name__}: {e}"
+            print(f"  FAILED: {failures[name]}")
+            continue
+        for case, m in cases.items():
+            results[case] = m
+            extra = "  ".join(f"{k}={v:.1f}" for k, v in m.items() if k.endswith(("_per_s", "_pct")))
+            print(f"  {case:<55} median {m['median_s'] * 1000:10.2f} ms  {extra}")
+            if m.get("over_budget"):
+                print(f"    over import budget of {m['budget_s']}s")
+                regressions.append(case)
+            if m.get("heavy_modules_loaded"):
+                print(f"    heavy modules loaded at import: {', '.join(m['heavy_modules_loaded'])}")
+
+    if baseline_path:
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+        print(f"\nComparison with {os.path.basename(baseline_path)}:")
+        regressions += compare(results, baseline, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = git_commit()
+        path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{commit}.json")
+        with open(path, "w") as f:
+            json.dump({"commit": commit, "timestamp": time.time(), "python": sys.version.split()[0],
+                       "results": results, "failures": failures}, f, indent=2)
+        print(f"\nSaved results to {os.path.relpath(path, fixtures.REPO_ROOT)}")
+
+    server.shutdown()
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%} or over budget")
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
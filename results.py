@@ -1,11 +1,8 @@
 import os
 import json
 import time
-import pandas as pd
 import requests
 from dotenv import load_dotenv
-import schedule
-import time
 
 
 load_dotenv()
@@ -73,6 +70,8 @@ def build_message(row):
 
 def send_summary_report():
     """Send new summary rows from Excel to Slack."""
+    import pandas as pd
+
     if not os.path.exists(EXCEL_PATH):
         print(f"❌ No Excel file found at {EXCEL_PATH}")
         return
@@ -100,6 +99,8 @@ def send_summary_report():
     print("✅ Summary report sent successfully.")
 
 if __name__ == "__main__":
+    import schedule
+
     # Schedule the job twice per day
     schedule.every().day.at("09:00").do(send_summary_report)
     schedule.every().day.at("19:00").do(send_summary_report)
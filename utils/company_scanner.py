@@ -0,0 +1,209 @@
+import os
+import csv
+import re
+from collections import deque
+from utils.schemas import parse_number
+
+# Resolved from the repository root so callers may run from any directory
+COMPANY_REFERENCE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comp.csv")
+
+# Common abbreviations -> reference company name in comp.csv (same list the
+# title triage prompt gives the LLM).
+ALIASES = {
+    "HPCL": "Hindustan Petroleum Corporation Ltd.",
+    "ONGC": "Oil & Natural Gas Corporation Ltd.",
+    "L&T": "Larsen & Toubro Ltd.",
+    "TCS": "Tata Consultancy Services Ltd.",
+    "SBI": "State Bank Of India",
+    "HUL": "Hindustan Unilever Ltd.",
+    "RIL": "Reliance Industries Ltd.",
+    "M&M": "Mahindra & Mahindra Ltd.",
+    "Maruti": "Maruti Suzuki India Ltd.",
+    "Infy": "Infosys Ltd.",
+}
+
+# NSE symbols that are ordinary words or other entities in speech
+AMBIGUOUS_SYMBOLS = {"OIL", "ACE", "BSE", "IDEA", "GOLD", "LT", "NH", "TI", "IT", "SUN", "TATA", "HOME", "JUST"}
+
+# Short name variants ("ITC", "ACC") only count when written in upper case,
+# as do NSE symbols ("DOLLAR", "TRENT" would otherwise match ordinary words)
+SHORT_PATTERN_LENGTH = 4
+
+# Match modes: any case, all upper case, or capitalised. Single-word names
+# are often ordinary words ("Eternal", "Insecticides", "Symphony", "Trident"),
+# so they only count when capitalised.
+_ANY_CASE, _UPPER, _CAPITALISED = None, "upper", "capitalised"
+
+_SUFFIX_RE = re.compile(r"\s*(\(india\)|\bltd\.?|\blimited)\s*", re.IGNORECASE)
+
+
+class _Automaton:
+    """Aho-Corasick automaton over lower-cased patterns."""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+    def add(self, pattern: str, payload):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append((len(pattern), payload))
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text: str):
+        """Yields (start, end, payload) for every pattern occurrence in `text`."""
+        node = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in out[node]:
+                yield i - length + 1, i + 1, payload
+
+
+def _name_variants(name: str) -> set[str]:
+    """"Larsen & Toubro Ltd." -> {"larsen & toubro ltd.", "larsen & toubro", "larsen and toubro", ...}"""
+    base = re.sub(r"\s+", " ", _SUFFIX_RE.sub(" ", name)).strip()
+    variants = {name.lower(), base.lower()}
+    variants |= {v.replace("&", "and") for v in variants}
+    variants |= {v.replace(".", "") for v in variants}
+    return {re.sub(r"\s+", " ", v).strip() for v in variants if v.strip()}
+
+
+def load_reference_companies(filepath=COMPANY_REFERENCE_CSV) -> list[dict]:
+    """Reads the reference company list (name, codes, industry, market cap in ₹ crore) from comp.csv."""
+    # The file is Latin-1 encoded (rupee sign / non-breaking spaces in market caps)
+    with open(filepath, "r", encoding="latin-1", newline="") as f:
+        return [
+            {
+                "company_name": row["Company Name"].strip(),
+                "bse_code": row.get("BSE Code", "").strip(),
+                "nse_symbol": row.get("NSE Symbol", "").strip(),
+                "industry": row.get("Industry", "").strip(),
+                # e.g. " ? 20,68,303.00 " (the ? is a mis-encoded rupee sign)
+                "market_cap_cr": parse_number(row.get("Latest Market Cap")),
+            }
+            for row in csv.DictReader(f)
+            if row.get("Company Name", "").strip()
+        ]
+
+
+class CompanyScanner:
+    """
+    Finds reference companies (names, aliases and NSE symbols) in free text
+    in a single linear pass using an Aho-Corasick automaton.
+    """
+
+    def __init__(self, companies: list[dict], aliases=ALIASES):
+        self.companies = {c["company_name"]: c for c in companies}
+        self._automaton = _Automaton()
+        seen = set()
+
+        def add(pattern, name, mode):
+            key = (pattern.lower(), name)
+            if key not in seen:
+                seen.add(key)
+                self._automaton.add(pattern.lower(), (name, mode))
+
+        # Aliases first so that they stay case-insensitive even when they
+        # coincide with a short NSE symbol ("TCS")
+        for alias, name in aliases.items():
+            if name in self.companies:
+                add(alias, name, _ANY_CASE)
+
+        for company in companies:
+            name = company["company_name"]
+            for variant in _name_variants(name):
+                if len(variant) <= SHORT_PATTERN_LENGTH:
+                    add(variant, name, _UPPER)
+                elif " " not in variant:
+                    add(variant, name, _CAPITALISED)
+                else:
+                    add(variant, name, _ANY_CASE)
+            symbol = company.get("nse_symbol", "")
+            if len(symbol) >= 3 and symbol not in AMBIGUOUS_SYMBOLS:
+                add(symbol, name, _UPPER)
+
+        self._automaton.build()
+
+    def scan(self, text: str) -> dict[str, dict]:
+        """
+        Returns `{company_name: {"count": n, "positions": [char offsets],
+        "nse_symbol": ..., "multi_word": bool}}` for every reference company
+        mentioned in `text`; `multi_word` is True if any mention was a
+        multi-word name. Overlapping matches resolve to the longest one
+        ("HDFC Bank Ltd." beats "HDFC Bank").
+        """
+        lowered = text.lower()
+        matches = []
+        for start, end, (name, mode) in self._automaton.iter(lowered):
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end < len(lowered) and lowered[end].isalnum():
+                continue
+            if mode == _UPPER and not text[start:end].isupper():
+                continue
+            if mode == _CAPITALISED and not text[start].isupper():
+                continue
+            matches.append((start, end, name))
+
+        # Keep the longest non-overlapping matches
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        results = {}
+        last_end = -1
+        for start, end, name in matches:
+            if start < last_end:
+                continue
+            last_end = end
+            entry = results.setdefault(name, {
+                "count": 0,
+                "positions": [],
+                "nse_symbol": self.companies[name].get("nse_symbol", ""),
+                "multi_word": False,
+            })
+            entry["count"] += 1
+            entry["positions"].append(start)
+            entry["multi_word"] = entry["multi_word"] or " " in text[start:end]
+        return results
+
+    def top_companies(self, text: str, limit=5, min_mentions=2) -> list[str]:
+        """
+        Names of the most-mentioned companies. A company named by a
+        multi-word name ("Bandhan Bank") counts from one mention; one only
+        seen as a single word or symbol needs `min_mentions`.
+        """
+        counts = self.scan(text)
+        ranked = sorted(counts.items(), key=lambda item: (-item[1]["count"], item[1]["positions"][0]))
+        return [name for name, info in ranked
+                if info["count"] >= (1 if info["multi_word"] else min_mentions)][:limit]
+
+
+_scanner = None
+
+def get_company_scanner(filepath=COMPANY_REFERENCE_CSV) -> CompanyScanner:
+    """Returns the shared scanner, building it from comp.csv on first use."""
+    global _scanner
+    if _scanner is None:
+        _scanner = CompanyScanner(load_reference_companies(filepath))
+    return _scanner
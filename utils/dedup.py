@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from utils.sharding import file_lock
+
+logger = logging.getLogger(__name__)
+
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", "dedup_index.json")
+# Cross-posts and re-uploads arrive within days of the original, so the index
+# only keeps recent videos; this bounds its file size and reload cost
+DEDUP_MAX_AGE_DAYS = float(os.getenv("DEDUP_MAX_AGE_DAYS", "30"))
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "2000"))
+
+NUM_HASHES = 128             # MinHash signature length
+LSH_BANDS = 32               # 32 bands x 4 rows: candidates from ~0.4 Jaccard
+LSH_ROWS = NUM_HASHES // LSH_BANDS
+TRANSCRIPT_THRESHOLD = 0.7   # estimated transcript Jaccard to count as a duplicate
+SHINGLE_WORDS = 5
+
+_MAX_HASH = (1 << 64) - 1
+_ARTIFACT_RE = re.compile(r"\[[^\]]*\]")
+_NON_WORD_RE = re.compile(r"[^a-z0-9%&]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lower-cases and strips caption markers ([Music]) and punctuation."""
+    text = _ARTIFACT_RE.sub(" ", text.lower())
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _hash64(value: str) -> int:
+    # Stable across processes, unlike the built-in hash()
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def minhash(shingles) -> list[int]:
+    """
+    One-permutation MinHash: each shingle is hashed once and only competes for
+    the minimum of its own bin, so the cost is linear in the number of
+    shingles rather than shingles x NUM_HASHES. Empty bins borrow from the
+    next non-empty bin (densification) so short texts remain comparable.
+    """
+    bins = [_MAX_HASH] * NUM_HASHES
+    for shingle in shingles:
+        h = _hash64(shingle)
+        b = h % NUM_HASHES
+        v = h // NUM_HASHES
+        if v < bins[b]:
+            bins[b] = v
+    if all(v == _MAX_HASH for v in bins):
+        return bins
+    signature = list(bins)
+    for i in range(NUM_HASHES):
+        j = i
+        while bins[j % NUM_HASHES] == _MAX_HASH:
+            j += 1
+        if j != i:
+            signature[i] = _hash64(f"{bins[j % NUM_HASHES]}:{j - i}")
+    return signature
+
+
+def transcript_signature(transcript: str) -> list[int]:
+    words = normalize_text(transcript).split()
+    if len(words) < SHINGLE_WORDS:
+        return minhash([" ".join(words)] if words else [])
+    return minhash(" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+
+
+def estimate_similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity from two MinHash signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _band_keys(signature: list[int]) -> list[str]:
+    return [f"{band}:" + ",".join(map(str, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]))
+            for band in range(LSH_BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of transcript MinHash signatures for processed videos,
+    storing each video's summary so near-duplicates can reuse it.
+    Persisted as JSON; band buckets are rebuilt in memory on load. Only the
+    newest `max_entries` videos from the last `max_age_days` are kept.
+    """
+
+    def __init__(self, path=DEDUP_INDEX_PATH, max_age_days=DEDUP_MAX_AGE_DAYS, max_entries=DEDUP_MAX_ENTRIES):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.entries = {}
+        self._transcript_buckets = {}
+        self._loaded_mtime = None
+        self.refresh()
+        self._prune()
+
+    def refresh(self):
+        """
+        Merges in entries saved to the file by other poller workers since it
+        was last read; a no-op while the file is unchanged.
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        try:
+            with open(self.path, "r") as f:
+                on_disk = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load dedup index {self.path}: {e}")
+            return
+        self._loaded_mtime = mtime
+        for video_id, entry in on_disk.items():
+            if video_id not in self.entries:
+                # Entries written before ages were tracked expire a full period from now
+                entry.setdefault("added_at", time.time())
+                self.entries[video_id] = entry
+                self._index(video_id, entry)
+
+    def _prune(self):
+        """Drops entries beyond the age/size limits and rebuilds the buckets if any went."""
+        cutoff = time.time() - self.max_age_days * 86400
+        newest = sorted(self.entries.items(), key=lambda item: item[1].get("added_at", 0), reverse=True)
+        kept = {video_id: entry for video_id, entry in newest[:self.max_entries]
+                if entry.get("added_at", 0) >= cutoff}
+        if len(kept) == len(self.entries):
+            return
+        self.entries = kept
+        self._transcript_buckets = {}
+        for video_id, entry in kept.items():
+            self._index(video_id, entry)
+
+    def _index(self, video_id, entry):
+        if entry.get("transcript_sig"):
+            for key in _band_keys(entry["transcript_sig"]):
+                self._transcript_buckets.setdefault(key, set()).add(video_id)
+
+    def find(self, transcript: str, exclude=None):
+        """
+        Returns `(video_id, entry, similarity)` for the indexed video whose
+        transcript is closest to `transcript`, if it is a near-duplicate,
+        otherwise None.
+        """
+        if not transcript:
+            return None
+        self.refresh()
+        signature = transcript_signature(transcript)
+        candidates = set()
+        for key in _band_keys(signature):
+            candidates |= self._transcript_buckets.get(key, set())
+        candidates.discard(exclude)
+        best = None
+        for video_id in candidates:
+            similarity = estimate_similarity(signature, self.entries[video_id].get("transcript_sig"))
+            if similarity >= TRANSCRIPT_THRESHOLD and (best is None or similarity > best[2]):
+                best = (video_id, self.entries[video_id], similarity)
+        return best
+
+    def add(self, video_id, url, title, transcript, summary):
+        entry = {
+            "url": url,
+            "title": title,
+            "transcript_sig": transcript_signature(transcript),
+            "summary": summary,
+            "added_at": time.time(),
+        }
+        self.entries[video_id] = entry
+        self._index(video_id, entry)
+
+    def save(self):
+        # Other poller workers share the file: merge their entries and
+        # write-then-rename under a lock so none are lost
+        with file_lock(self.path):
+            self._loaded_mtime = None
+            self.refresh()
+            self._prune()
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
@@ -0,0 +1,229 @@
+import re
+import sys
+import json
+from bisect import bisect_right
+from utils.schemas import parse_number
+
+# Canonical metric name -> spoken/written variants. More specific metrics
+# ("EBITDA margin") must come before their prefixes ("EBITDA").
+METRIC_PATTERNS = {
+    "Revenue": r"revenues?|top[- ]?line|sales|turnover|income from operations",
+    "EBITDA Margin": r"ebitda margins?|operating margins?",
+    "EBITDA": r"ebitda|operating profit",
+    "PAT Margin": r"pat margins?|net margins?|net profit margins?",
+    "PAT": r"pat|net profit|profit after tax|bottom[- ]?line|net income|profits?",
+    "Gross Margin": r"gross margins?",
+    "EPS": r"eps|earnings per share",
+    "Order Book": r"order ?book|order inflows?|orders",
+    "Volume": r"volumes?",
+    "AUM": r"aum|assets under management",
+    "Loan Book": r"loan book|advances|loan growth|disbursements?",
+    "Deposits": r"deposits?",
+}
+
+PERIOD_PATTERNS = {
+    "YoY": r"y-?o-?y|year[- ]on[- ]year|year[- ]over[- ]year|annual(?:ly)?|versus last year|over last year",
+    "QoQ": r"q-?o-?q|quarter[- ]on[- ]quarter|quarter[- ]over[- ]quarter|sequential(?:ly)?",
+}
+
+# A sign directly after a number ("30-35%", "30 -35%") is a range hyphen, not a
+# minus; the range itself is handled by _RANGE_PREFIX_RE
+_PERCENT_RE = re.compile(
+    r"((?:(?<!\d)(?<!\d\s)[-+])?\d[\d,]*(?:\.\d+)?)\s*(?:%|percent\b|per cent\b|pc\b)",
+    re.IGNORECASE,
+)
+_METRIC_RE = re.compile(
+    "|".join(f"(?P<m{i}>\\b(?:{pattern})\\b)" for i, pattern in enumerate(METRIC_PATTERNS.values())),
+    re.IGNORECASE,
+)
+_METRIC_NAMES = list(METRIC_PATTERNS.keys())
+_PERIOD_RE = re.compile(
+    "|".join(f"(?P<{name}>\\b(?:{pattern})\\b)" for name, pattern in PERIOD_PATTERNS.items()),
+    re.IGNORECASE,
+)
+_QUARTER_RE = re.compile(r"\b(q[1-4]\s?fy\s?'?\d{2,4}|fy\s?'?\d{2,4}|h[12]\s?fy\s?'?\d{2,4})\b", re.IGNORECASE)
+_RANGE_PREFIX_RE = re.compile(r"([-+]?\d[\d,]*(?:\.\d+)?)\s*(?:to|-)\s*$", re.IGNORECASE)
+# "margin expanded to 16.8%", "PAT margin was 14.2%": a level, not a growth rate
+# "expanded to 16.8% from 12%": the value after "from" is the baseline
+_FROM_PREFIX_RE = re.compile(r"\bfrom\s*(?:about|around|nearly|almost)?\s*$", re.IGNORECASE)
+# Sentence ends (not decimal points): a metric in another sentence never applies
+_SENTENCE_END_RE = re.compile(r"[.?!](?=\s|$)")
+_LEVEL_PREFIX_RE = re.compile(r"\b(?:to|at|was|is|were|of about|in the)\s*(?:about|around|nearly|almost)?\s*$", re.IGNORECASE)
+_UP_RE = re.compile(r"\b(gr[eo]w|grown|growth|up|increas\w*|ris\w*|rose|jump\w*|surg\w*|expan\w*|improv\w*|higher|doubl\w*)\b", re.IGNORECASE)
+_DOWN_RE = re.compile(r"\b(declin\w*|fell|fall\w*|down|drop\w*|decreas\w*|contract\w*|lower|degrow\w*|shrank|shrink\w*)\b", re.IGNORECASE)
+
+# How far (in characters) around a percentage to look for its metric and period.
+LOOKBEHIND_CHARS = 90
+LOOKAHEAD_CHARS = 50
+
+
+def _join_segments(transcript) -> tuple[str, list[int], list]:
+    """Flattens a transcript into one string plus segment start offsets/timestamps."""
+    if isinstance(transcript, str):
+        return transcript, [0], [None]
+
+    parts, offsets, starts = [], [], []
+    position = 0
+    for seg in transcript:
+        text = str(seg.get("text", "")).replace("\n", " ").strip()
+        if not text:
+            continue
+        offsets.append(position)
+        starts.append(seg.get("start"))
+        parts.append(text)
+        position += len(text) + 1
+    return " ".join(parts), offsets or [0], starts or [None]
+
+
+def _nearest_metric(window: str, anchor: int):
+    """Returns the canonical metric mentioned closest to `anchor` within `window`."""
+    best_name, best_distance = None, None
+    for match in _METRIC_RE.finditer(window):
+        if match.end() <= anchor:
+            distance = anchor - match.end()
+        else:
+            # Prefer metrics before the number ("revenue grew 42%") over after it
+            distance = match.start() - anchor + 20
+        if best_distance is None or distance < best_distance:
+            best_name, best_distance = _METRIC_NAMES[int(match.lastgroup[1:])], distance
+    return best_name, best_distance
+
+
+def _nearest_period(window: str, anchor: int):
+    """Returns the period match ("YoY"/"QoQ") closest to `anchor` within `window`."""
+    best, best_distance = None, None
+    for match in _PERIOD_RE.finditer(window):
+        distance = anchor - match.end() if match.end() <= anchor else match.start() - anchor
+        if best_distance is None or distance < best_distance:
+            best, best_distance = match, distance
+    return best
+
+
+def canonical_metric(name: str) -> str:
+    """Maps a free-text metric name ("Net Profit", "Top line") to its canonical name."""
+    match = _METRIC_RE.search(str(name or ""))
+    return _METRIC_NAMES[int(match.lastgroup[1:])] if match else str(name or "").strip()
+
+
+def extract_growth_mentions(transcript, min_growth=None) -> list[dict]:
+    """
+    Scans a transcript for metric/percentage/period patterns and returns growth
+    records in the same shape as the LLM `growth_mentions`
+    (metric, growth_value, context, timestamp_seconds, type, reliability).
+
+    `transcript` is either plain text or a list of `{"text", "start"}` segments;
+    timestamps are only available for the latter. If `min_growth` is given,
+    only records with `growth_value > min_growth` are returned.
+    """
+    text, offsets, starts = _join_segments(transcript)
+    mentions = []
+    seen = set()
+
+    for pct in _PERCENT_RE.finditer(text):
+        value = parse_number(pct.group(1))
+        if value is None:
+            continue
+
+        window_start = max(0, pct.start() - LOOKBEHIND_CHARS)
+        window_end = min(len(text), pct.end() + LOOKAHEAD_CHARS)
+        # Clip the window to the sentence containing the percentage
+        for end in _SENTENCE_END_RE.finditer(text, window_start, pct.start()):
+            window_start = end.end()
+        next_end = _SENTENCE_END_RE.search(text, pct.end(), window_end)
+        if next_end:
+            window_end = next_end.end()
+        window = text[window_start:window_end]
+
+        metric, distance = _nearest_metric(window, pct.start() - window_start)
+        if not metric:
+            continue
+
+        before = text[window_start:pct.start()]
+        # "15 to 17 percent": keep the conservative lower bound
+        range_prefix = _RANGE_PREFIX_RE.search(before)
+        if range_prefix:
+            value = parse_number(range_prefix.group(1))
+            before = before[:range_prefix.start()]
+        if _FROM_PREFIX_RE.search(before):
+            continue
+        if _LEVEL_PREFIX_RE.search(before) and not re.search(r"\bgr[eo]w(?:th)?\b", before[-20:], re.IGNORECASE):
+            continue
+
+        is_down = _DOWN_RE.search(before) and not _UP_RE.search(before[-25:])
+        has_direction = bool(is_down or _UP_RE.search(window))
+        period_match = _nearest_period(window, pct.start() - window_start)
+        # A bare "margin of 22%" is a level, not growth
+        if not has_direction and not period_match:
+            continue
+        if is_down:
+            value = -abs(value)
+
+        period = period_match.lastgroup if period_match else ""
+        quarter = _QUARTER_RE.search(window)
+        if quarter:
+            period = f"{period} {quarter.group(1).upper()}".strip()
+
+        segment_index = bisect_right(offsets, pct.start()) - 1
+        timestamp = starts[segment_index]
+
+        key = (metric, value, timestamp)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if min_growth is not None and value <= min_growth:
+            continue
+
+        mentions.append({
+            "metric": metric,
+            "growth_value": value,
+            "context": window.strip(),
+            "timestamp_seconds": int(timestamp) if isinstance(timestamp, (int, float)) else None,
+            "type": period or "Unspecified",
+            "reliability": "High" if distance is not None and distance <= 40 and period_match else "Medium",
+        })
+
+    return mentions
+
+
+def reconcile_growth_mentions(llm_mentions: list[dict], local_mentions: list[dict], tolerance=0.5) -> list[dict]:
+    """
+    Cross-checks LLM growth mentions against locally extracted ones.
+
+    LLM values are coerced to floats; a mention that matches a local record
+    (same metric, value within `tolerance`) takes the local value and exact
+    timestamp and is marked "Verified". Unmatched LLM mentions are kept as-is.
+    """
+    reconciled = []
+    for mention in llm_mentions or []:
+        mention = dict(mention)
+        value = parse_number(mention.get("growth_value"))
+        if value is None:
+            continue
+        mention["growth_value"] = value
+
+        for local in local_mentions:
+            same_metric = local["metric"] == canonical_metric(mention.get("metric"))
+            if same_metric and abs(local["growth_value"] - value) <= tolerance:
+                mention["growth_value"] = local["growth_value"]
+                if local["timestamp_seconds"] is not None:
+                    mention["timestamp_seconds"] = local["timestamp_seconds"]
+                mention["reliability"] = "Verified"
+                break
+        reconciled.append(mention)
+    return reconciled
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.growth_extraction <transcript.txt | segments.json | youtube_url>
+    source = sys.argv[1]
+    if source.startswith("http"):
+        from utils.transcription import get_transcript_segments
+        data = get_transcript_segments(source)
+    elif source.endswith(".json"):
+        with open(source, "r") as f:
+            data = json.load(f)
+    else:
+        with open(source, "r") as f:
+            data = f.read()
+    print(json.dumps(extract_growth_mentions(data), indent=2))
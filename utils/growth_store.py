@@ -0,0 +1,211 @@
+import os
+import time
+import sqlite3
+import logging
+import argparse
+from contextlib import closing
+from utils.schemas import parse_number
+from utils.growth_extraction import canonical_metric
+from utils.company_scanner import load_reference_companies
+
+logger = logging.getLogger(__name__)
+
+GROWTH_DB_PATH = os.getenv("GROWTH_DB_PATH", "growth_history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    isin TEXT PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    nse_symbol TEXT,
+    bse_code TEXT,
+    sector TEXT,
+    industry TEXT,
+    market_cap_cr REAL
+);
+CREATE TABLE IF NOT EXISTS growth (
+    id INTEGER PRIMARY KEY,
+    isin TEXT NOT NULL REFERENCES companies(isin),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    period TEXT,
+    reliability TEXT,
+    timestamp_seconds REAL,
+    video_url TEXT,
+    title TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_growth_metric ON growth(metric, recorded_at, value);
+CREATE INDEX IF NOT EXISTS idx_growth_isin ON growth(isin, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_companies_industry ON companies(industry);
+"""
+
+_UPSERT_COMPANY = """
+INSERT INTO companies (isin, company_name, nse_symbol, bse_code, sector, industry, market_cap_cr)
+VALUES (:isin, :company_name, :nse_symbol, :bse_code, :sector, :industry, :market_cap_cr)
+ON CONFLICT(isin) DO UPDATE SET
+    company_name = excluded.company_name,
+    nse_symbol = COALESCE(NULLIF(excluded.nse_symbol, ''), companies.nse_symbol),
+    bse_code = COALESCE(NULLIF(excluded.bse_code, ''), companies.bse_code),
+    sector = COALESCE(NULLIF(excluded.sector, ''), companies.sector),
+    industry = COALESCE(NULLIF(excluded.industry, ''), companies.industry),
+    market_cap_cr = COALESCE(excluded.market_cap_cr, companies.market_cap_cr)
+"""
+
+
+def connect(path=GROWTH_DB_PATH) -> sqlite3.Connection:
+    """Opens the growth store, creating the tables on first use."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _code(value) -> str:
+    """Normalizes an exchange code read from Excel/CSV (500325.0 -> "500325", NaN -> "")."""
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+_reference_index = None
+
+def _reference_lookup(nse_symbol, bse_code):
+    """comp.csv row (market cap, industry) for a company, by NSE symbol or BSE code."""
+    global _reference_index
+    if _reference_index is None:
+        _reference_index = {}
+        try:
+            for row in load_reference_companies():
+                if row["nse_symbol"]:
+                    _reference_index[("nse", row["nse_symbol"].upper())] = row
+                if row["bse_code"]:
+                    _reference_index[("bse", row["bse_code"])] = row
+        except FileNotFoundError:
+            logger.warning("comp.csv not found; market caps will be missing from the growth store")
+    return (_reference_index.get(("nse", nse_symbol.upper()))
+            or _reference_index.get(("bse", bse_code)))
+
+
+def _company_row(company_info) -> dict:
+    nse_symbol = _code(company_info.get("nse_symbol"))
+    bse_code = _code(company_info.get("bse_code"))
+    reference = _reference_lookup(nse_symbol, bse_code) or {}
+    return {
+        "isin": _code(company_info.get("isin")),
+        "company_name": company_info.get("company_name", ""),
+        "nse_symbol": nse_symbol,
+        "bse_code": bse_code,
+        "sector": _code(company_info.get("sector")),
+        # comp.csv industries are the ones used for filtering ("Bank - Private")
+        "industry": reference.get("industry") or _code(company_info.get("industry")),
+        "market_cap_cr": reference.get("market_cap_cr"),
+    }
+
+
+def sync_companies(companies, path=GROWTH_DB_PATH) -> int:
+    """
+    Upserts company rows (dicts as built by `auto.load_company_data`) keyed by
+    ISIN, enriched with industry and numeric market cap from comp.csv.
+    Returns the number of companies written.
+    """
+    rows = [row for row in map(_company_row, companies) if row["isin"]]
+    with closing(connect(path)) as conn, conn:
+        conn.executemany(_UPSERT_COMPANY, rows)
+    return len(rows)
+
+
+def record_growth(company_info, growth_mentions, video_url, title="", recorded_at=None, path=GROWTH_DB_PATH) -> int:
+    """
+    Stores one normalized row per numeric growth mention for the company
+    (canonical metric name, float value). Returns the number of rows written;
+    companies without an ISIN are skipped.
+    """
+    company = _company_row(company_info)
+    if not company["isin"]:
+        return 0
+    recorded_at = time.time() if recorded_at is None else recorded_at
+    rows = []
+    for g in growth_mentions:
+        value = parse_number(g.get("growth_value"))
+        if value is None:
+            continue
+        ts = g.get("timestamp_seconds")
+        rows.append((
+            company["isin"], canonical_metric(g.get("metric")), value, g.get("type"),
+            g.get("reliability"), ts if isinstance(ts, (int, float)) else None,
+            video_url, title, recorded_at,
+        ))
+    if not rows:
+        return 0
+    with closing(connect(path)) as conn, conn:
+        conn.execute(_UPSERT_COMPANY, company)
+        conn.executemany(
+            "INSERT INTO growth (isin, metric, value, period, reliability, timestamp_seconds,"
+            " video_url, title, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+def query_growth(metric=None, min_value=None, industry=None, days=None, min_market_cap=None,
+                 isin=None, limit=None, path=GROWTH_DB_PATH) -> list[dict]:
+    """
+    Growth records joined with company data, highest growth first, e.g.
+    `query_growth("Revenue", min_value=30, industry="Bank - Private", days=30)`.
+    """
+    clauses, params = [], []
+    if metric:
+        clauses.append("g.metric = ?")
+        params.append(canonical_metric(metric))
+    if min_value is not None:
+        clauses.append("g.value > ?")
+        params.append(min_value)
+    if industry:
+        clauses.append("c.industry = ?")
+        params.append(industry)
+    if days is not None:
+        clauses.append("g.recorded_at >= ?")
+        params.append(time.time() - days * 86400)
+    if min_market_cap is not None:
+        clauses.append("c.market_cap_cr >= ?")
+        params.append(min_market_cap)
+    if isin:
+        clauses.append("g.isin = ?")
+        params.append(isin)
+    sql = (
+        "SELECT c.company_name, g.isin, c.nse_symbol, c.industry, c.market_cap_cr,"
+        " g.metric, g.value, g.period, g.reliability, g.timestamp_seconds,"
+        " g.video_url, g.title, g.recorded_at"
+        " FROM growth g JOIN companies c ON c.isin = g.isin"
+    )
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY g.value DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with closing(connect(path)) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the per-company growth history.")
+    parser.add_argument("--metric", help='e.g. "Revenue", "PAT", "EBITDA Margin"')
+    parser.add_argument("--min", type=float, dest="min_value", help="only growth above this %%")
+    parser.add_argument("--industry", help='comp.csv industry, e.g. "Bank - Private"')
+    parser.add_argument("--days", type=float, help="only records from the last N days")
+    parser.add_argument("--min-market-cap", type=float, help="in ₹ crore")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--db", default=GROWTH_DB_PATH)
+    args = parser.parse_args()
+
+    results = query_growth(args.metric, args.min_value, args.industry, args.days,
+                           args.min_market_cap, limit=args.limit, path=args.db)
+    for r in results:
+        cap = f"{r['market_cap_cr']:,.0f} cr" if r["market_cap_cr"] is not None else "n/a"
+        recorded = time.strftime("%Y-%m-%d", time.localtime(r["recorded_at"]))
+        print(f"{recorded}  {r['company_name']:<40} {r['metric']:<14} {r['value']:>7.1f}%  "
+              f"{r['period'] or '':<12} {r['industry'] or '':<24} {cap:>14}  {r['video_url']}")
+    print(f"{len(results)} records")
@@ -0,0 +1,139 @@
+import os
+import time
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from utils import metrics
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Backend selection. LLM_BACKEND picks the default for every call;
+# TRIAGE_LLM_BACKEND / SUMMARY_LLM_BACKEND override it per purpose, e.g. to
+# run the high-volume title triage on a local model and summaries on OpenAI.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+PURPOSE_BACKENDS = {
+    "triage": os.getenv("TRIAGE_LLM_BACKEND") or LLM_BACKEND,
+    "summary": os.getenv("SUMMARY_LLM_BACKEND") or LLM_BACKEND,
+}
+
+OPENAI_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/") + "/chat/completions"
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5-mini")
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# Ollama serves an OpenAI-compatible API under /v1
+OLLAMA_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/") + "/v1/chat/completions"
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+
+
+class ChatBackend:
+    """
+    An OpenAI-compatible chat completions endpoint.
+
+    `max_concurrency` bounds the number of in-flight requests across all
+    threads using this backend; `chat_batch` fans requests out up to that limit.
+    """
+    name = "openai-compatible"
+    requires_api_key = False
+
+    def __init__(self, url, model, api_key=None, max_concurrency=4, timeout=60, retry_delay=5):
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def chat(self, messages, model=None, response_format=None, max_retries=3) -> str | None:
+        """Sends one chat request and returns the stripped message content, or None."""
+        if self.requires_api_key and not self.api_key:
+            logger.error(f"API key not set for {self.name} backend")
+            return None
+
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+
+        for attempt in range(max_retries):
+            try:
+                with self._semaphore:
+                    response = requests.post(self.url, headers=self._headers(), json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                result = response.json()
+                metrics.record_token_usage(self.name, payload["model"], result.get("usage"))
+                return result["choices"][0]["message"]["content"].strip()
+            except Exception as e:
+                logger.warning(f"[{self.name}] Attempt {attempt + 1} failed: {e}")
+                metrics.inc("llm_request_failures_total", backend=self.name)
+                time.sleep(self.retry_delay)
+        return None
+
+    def chat_batch(self, messages_list, **kwargs) -> list[str | None]:
+        """Runs `chat` for each message list concurrently, preserving order."""
+        if not messages_list:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(messages_list))) as pool:
+            return list(pool.map(lambda messages: self.chat(messages, **kwargs), messages_list))
+
+
+class OpenAIBackend(ChatBackend):
+    name = "openai"
+    requires_api_key = True
+
+    def __init__(self, api_key=None, model=None, **kwargs):
+        kwargs.setdefault("max_concurrency", OPENAI_MAX_CONCURRENCY)
+        super().__init__(OPENAI_URL, model or OPENAI_MODEL, api_key=api_key or os.getenv("OPENAI_API_KEY"), **kwargs)
+
+
+class OllamaBackend(ChatBackend):
+    name = "ollama"
+
+    def __init__(self, model=None, **kwargs):
+        kwargs.setdefault("max_concurrency", OLLAMA_MAX_CONCURRENCY)
+        kwargs.setdefault("timeout", 300)
+        kwargs.setdefault("retry_delay", 1)
+        super().__init__(OLLAMA_URL, model or OLLAMA_MODEL, **kwargs)
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "ollama": OllamaBackend,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(purpose="summary", **kwargs) -> ChatBackend:
+    """
+    Returns the configured backend for `purpose` ("triage" or "summary").
+
+    Calls without overrides share one instance per backend so that its
+    concurrency limit applies process-wide.
+    """
+    kind = PURPOSE_BACKENDS.get(purpose, LLM_BACKEND)
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{kind}'. Choose from: {', '.join(BACKENDS)}")
+
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+    if kwargs:
+        return BACKENDS[kind](**kwargs)
+
+    with _instances_lock:
+        if kind not in _instances:
+            _instances[kind] = BACKENDS[kind]()
+        return _instances[kind]
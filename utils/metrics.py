@@ -0,0 +1,153 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) for the stage latency histograms. Stages range from
+# millisecond matching to multi-minute Whisper runs.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()
+_histograms = {}  # stage -> {"buckets": [counts], "sum": float, "count": int}
+_counters = {}    # (name, ((label, value), ...)) -> float
+
+
+def observe(stage: str, seconds: float):
+    """Records one latency observation for `stage`."""
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = {"buckets": [0] * len(DEFAULT_BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Records the duration of the wrapped block under `stage`.
+    Also usable as a function decorator: `@timed("matching")`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def inc(name: str, value=1, **labels):
+    """Increments the counter `name` with the given labels."""
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def record_cache(cache: str, hit: bool):
+    inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def record_token_usage(backend: str, model: str, usage: dict):
+    """Records the `usage` block of a chat completions response."""
+    if not usage:
+        return
+    inc("llm_prompt_tokens_total", usage.get("prompt_tokens", 0), backend=backend, model=model)
+    inc("llm_completion_tokens_total", usage.get("completion_tokens", 0), backend=backend, model=model)
+
+
+def snapshot() -> dict:
+    """Returns all metrics as a JSON-serialisable dict."""
+    with _lock:
+        stages = {
+            stage: {
+                "count": hist["count"],
+                "sum_seconds": round(hist["sum"], 6),
+                "avg_seconds": round(hist["sum"] / hist["count"], 6) if hist["count"] else 0.0,
+                "buckets": {str(bound): n for bound, n in zip(DEFAULT_BUCKETS, hist["buckets"])},
+            }
+            for stage, hist in _histograms.items()
+        }
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _counters.items()
+        ]
+
+    hits, totals = {}, {}
+    for c in counters:
+        if c["name"] == "cache_requests_total":
+            cache = c["labels"]["cache"]
+            totals[cache] = totals.get(cache, 0) + c["value"]
+            if c["labels"]["result"] == "hit":
+                hits[cache] = hits.get(cache, 0) + c["value"]
+    hit_rates = {cache: round(hits.get(cache, 0) / total, 4) for cache, total in totals.items() if total}
+
+    return {"timestamp": time.time(), "stages": stages, "counters": counters, "cache_hit_rates": hit_rates}
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def render_prometheus() -> str:
+    """Renders all metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        if _histograms:
+            lines.append("# TYPE stage_duration_seconds histogram")
+        for stage, hist in sorted(_histograms.items()):
+            for bound, n in zip(DEFAULT_BUCKETS, hist["buckets"]):
+                lines.append(f'stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {n}')
+            lines.append(f'stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist["count"]}')
+            lines.append(f'stage_duration_seconds_sum{{stage="{stage}"}} {hist["sum"]}')
+            lines.append(f'stage_duration_seconds_count{{stage="{stage}"}} {hist["count"]}')
+
+        typed = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def dump_json(path: str):
+    """Writes the current metrics snapshot to `path`."""
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, content_type = json.dumps(snapshot()).encode(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, content_type = render_prometheus().encode(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host="0.0.0.0") -> ThreadingHTTPServer:
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,95 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from utils import metrics
+from utils.transcription import extract_video_id, fetch_caption_segments, get_transcript_segments, DiskTranscriptCache
+
+logger = logging.getLogger(__name__)
+
+CAPTION_PREFETCH_WORKERS = int(os.getenv("CAPTION_PREFETCH_WORKERS", "8"))
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", "1"))
+WHISPER_NICE = int(os.getenv("WHISPER_NICE", "10"))
+
+
+def _fetch_captions_into_cache(video_url, cache) -> bool:
+    """Returns True if captions are (now) cached for `video_url`."""
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        return False
+    cached = cache.get(video_id) is not None
+    # Separate label: every prefetched video is looked up again when processed
+    metrics.record_cache("transcript_prefetch", cached)
+    if cached:
+        return True
+    try:
+        segments = fetch_caption_segments(video_id)
+    except Exception as e:
+        logger.info(f"[prefetch] No captions for {video_id}: {e}")
+        return False
+    metrics.inc("transcript_source_total", source="captions")
+    cache.set(video_id, segments)
+    return True
+
+
+def prefetch_captions(video_urls, cache, max_workers=CAPTION_PREFETCH_WORKERS) -> list[str]:
+    """
+    Fetches caption transcripts for all `video_urls` concurrently (at most
+    `max_workers` in flight) and stores them in `cache`.
+    Returns the URLs without captions, i.e. those needing the Whisper fallback.
+    """
+    video_urls = list(dict.fromkeys(video_urls))
+    if not video_urls:
+        return []
+    with metrics.timed("caption_prefetch"):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(video_urls))) as pool:
+            available = list(pool.map(lambda url: _fetch_captions_into_cache(url, cache), video_urls))
+    return [url for url, ok in zip(video_urls, available) if not ok]
+
+
+def _lower_priority():
+    """Process pool initializer: run Whisper at reduced CPU priority."""
+    try:
+        os.nice(WHISPER_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+def _transcribe_into_cache(video_url, cache_dir):
+    # Runs in a worker process; tries captions once more before Whisper
+    get_transcript_segments(video_url, cache=DiskTranscriptCache(cache_dir))
+    return video_url
+
+
+class WhisperScheduler:
+    """
+    Runs Whisper transcriptions on a separate low-priority process pool so
+    they never block caption-only videos. Results land in a shared
+    DiskTranscriptCache.
+    """
+
+    def __init__(self, cache_dir, max_workers=WHISPER_WORKERS):
+        self.cache_dir = cache_dir
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_lower_priority)
+        self._futures = {}
+
+    def submit(self, video_url):
+        """Queues `video_url` for transcription unless it is already queued."""
+        if video_url not in self._futures:
+            self._futures[video_url] = self._pool.submit(_transcribe_into_cache, video_url, self.cache_dir)
+            metrics.inc("whisper_jobs_submitted_total")
+
+    def is_pending(self, video_url) -> bool:
+        future = self._futures.get(video_url)
+        return future is not None and not future.done()
+
+    def pop_finished(self) -> dict:
+        """Returns `{video_url: error_or_None}` for finished jobs and forgets them."""
+        finished = {}
+        for url, future in list(self._futures.items()):
+            if future.done():
+                finished[url] = future.exception()
+                del self._futures[url]
+        return finished
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -74,7 +74,8 @@ class PDF(FPDF):
             # Avoid empty or whitespace-only strings
             if not text.strip() or text == "-":
                 continue
-            self.multi_cell(0, 10, text.encode('latin-1', 'replace').decode('latin-1'))
+            # Return to the left margin, otherwise the next full-width item has no room
+            self.multi_cell(0, 10, text.encode('latin-1', 'replace').decode('latin-1'), new_x="LMARGIN", new_y="NEXT")
         self.ln()
 
 def create_pdf_report(summary_data: dict) -> bytes:
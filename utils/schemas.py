@@ -0,0 +1,204 @@
+import json
+import re
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaValidationError(ValueError):
+    """Raised when model output does not match the expected summary schema."""
+
+
+# JSON schema sent to the API as a structured-output response format.
+# Strict mode requires an object at the top level, so the company records
+# are wrapped in a `companies` array.
+GROWTH_MENTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "metric": {"type": "string"},
+        "growth_value": {"type": "number"},
+        "context": {"type": "string"},
+        "timestamp_seconds": {"type": ["number", "null"]},
+        "type": {"type": "string"},
+        "reliability": {"type": "string"},
+    },
+    "required": ["metric", "growth_value", "context", "timestamp_seconds", "type", "reliability"],
+    "additionalProperties": False,
+}
+
+COMPANY_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "company_name": {"type": "string"},
+        "speaker": {"type": "string"},
+        "note": {"type": "string"},
+        "growth_mentions": {"type": "array", "items": GROWTH_MENTION_SCHEMA},
+    },
+    "required": ["company_name", "speaker", "note", "growth_mentions"],
+    "additionalProperties": False,
+}
+
+SUMMARY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "company_summaries",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "companies": {"type": "array", "items": COMPANY_SUMMARY_SCHEMA},
+            },
+            "required": ["companies"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def parse_number(value) -> Optional[float]:
+    """Coerces values like 42, "42", "42%" or "+1,200.5 %" to a float."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"[-+]?\d[\d,]*(?:\.\d+)?", str(value))
+    if not match:
+        return None
+    return float(match.group(0).replace(",", ""))
+
+
+@dataclass
+class GrowthMention:
+    metric: str
+    growth_value: float
+    context: str = ""
+    timestamp_seconds: Optional[float] = None
+    type: str = ""
+    reliability: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GrowthMention":
+        if not isinstance(data, dict):
+            raise SchemaValidationError(f"growth mention must be an object, got {type(data).__name__}")
+        growth_value = parse_number(data.get("growth_value"))
+        if growth_value is None:
+            raise SchemaValidationError(f"growth_value is not numeric: {data.get('growth_value')!r}")
+        return cls(
+            metric=str(data.get("metric") or "Unknown").strip(),
+            growth_value=growth_value,
+            context=str(data.get("context") or "").strip(),
+            timestamp_seconds=parse_number(data.get("timestamp_seconds")),
+            type=str(data.get("type") or "").strip(),
+            reliability=str(data.get("reliability") or "").strip(),
+        )
+
+
+@dataclass
+class CompanySummary:
+    company_name: str
+    speaker: str = ""
+    note: str = ""
+    growth_mentions: list[GrowthMention] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompanySummary":
+        if not isinstance(data, dict):
+            raise SchemaValidationError(f"company summary must be an object, got {type(data).__name__}")
+        company_name = str(data.get("company_name") or "").strip()
+        if not company_name:
+            raise SchemaValidationError("company_name is missing")
+        mentions = data.get("growth_mentions") or []
+        if not isinstance(mentions, list):
+            raise SchemaValidationError("growth_mentions must be a list")
+        # One bad mention (backends without strict schemas return values like
+        # "strong") is dropped rather than failing the whole summary
+        growth_mentions = []
+        for mention in mentions:
+            try:
+                growth_mentions.append(GrowthMention.from_dict(mention))
+            except SchemaValidationError as e:
+                logger.warning(f"Dropping invalid growth mention for {company_name}: {e}")
+        return cls(
+            company_name=company_name,
+            speaker=str(data.get("speaker") or "").strip(),
+            note=str(data.get("note") or "").strip(),
+            growth_mentions=growth_mentions,
+        )
+
+
+_STRING_RE = re.compile(r'("(?:\\.|[^"\\])*")')
+
+
+def repair_json(text: str) -> str:
+    """
+    Fixes the common, cheap-to-repair problems in model JSON output:
+    markdown code fences, leading/trailing prose, trailing commas and
+    missing commas between members on consecutive lines.
+    """
+    text = text.strip()
+
+    # Strip ```json ... ``` fences
+    fence = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+
+    # Drop any prose around the outermost array/object
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if starts:
+        start = min(starts)
+        end = max(text.rfind("]"), text.rfind("}"))
+        if end > start:
+            text = text[start:end + 1]
+
+    # The remaining repairs only touch the text between string literals, so
+    # commas and brackets inside values ("note": "x, ]") are left alone.
+    # Even indices are gaps between strings, odd indices the strings themselves.
+    parts = _STRING_RE.split(text)
+    for i in range(0, len(parts), 2):
+        gap = parts[i]
+        # Trailing commas: `[1, 2,]` / `{"a": 1,}`
+        gap = re.sub(r",(\s*[\]}])", r"\1", gap)
+        # Missing commas between a value and the next key on a new line
+        if i + 1 < len(parts):
+            if i > 0 and re.fullmatch(r"\s*\n\s*", gap):
+                gap = "," + gap
+            else:
+                gap = re.sub(r"(\d|true|false|null|[\]}])(\s*\n\s*)$", r"\1,\2", gap)
+        parts[i] = gap
+    return "".join(parts)
+
+
+def load_json_lenient(text: str):
+    """Parses JSON, applying `repair_json` only if the strict parse fails."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(repair_json(text))
+
+
+def parse_summary_response(text: str) -> list[dict]:
+    """
+    Parses and validates the summary model output.
+
+    Accepts either the structured-output shape `{"companies": [...]}` or a
+    bare array of company objects. Returns plain dicts so callers can keep
+    using `entry.get(...)`. Invalid growth mentions are logged and dropped.
+
+    Raises:
+        json.JSONDecodeError: if the output cannot be parsed even after repair.
+        SchemaValidationError: if the parsed output does not match the schema.
+    """
+    data = load_json_lenient(text)
+
+    if isinstance(data, dict):
+        if "companies" in data:
+            data = data["companies"]
+        elif "company_name" in data:
+            data = [data]
+    if not isinstance(data, list):
+        raise SchemaValidationError(f"expected a list of companies, got {type(data).__name__}")
+
+    return [asdict(CompanySummary.from_dict(item)) for item in data]
@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import bisect
+import socket
+import sqlite3
+import hashlib
+from contextlib import closing, contextmanager
+
+# Shipped with the code, so resolved from the repository root by default
+CHANNELS_CONFIG = os.getenv(
+    "CHANNELS_CONFIG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "channels.json"),
+)
+SHARD_STATE_PATH = os.getenv("SHARD_STATE_PATH", "shard_state.db")
+WORKER_TTL = int(os.getenv("WORKER_TTL", "1800"))     # seconds without a heartbeat before a worker's shard moves
+LEASE_TTL = int(os.getenv("VIDEO_LEASE_TTL", "3600"))  # seconds before an unfinished video lease can be taken over
+HASH_RING_REPLICAS = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,  -- 'leased' or 'done'
+    owner TEXT,
+    lease_expires REAL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def load_channel_ids(path=CHANNELS_CONFIG) -> list[str]:
+    """Reads the YouTube channel IDs to poll from the JSON config (`{"channels": [...]}`)."""
+    with open(path, "r") as f:
+        config = json.load(f)
+    channels = config["channels"] if isinstance(config, dict) else config
+    return list(dict.fromkeys(str(c).strip() for c in channels if str(c).strip()))
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive advisory lock on `<path>.lock`, held for the duration of the
+    block, for files that several poller processes read-modify-write.
+    """
+    with open(f"{path}.lock", "a+") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _hash(value: str) -> int:
+    # Stable across processes and hosts, unlike the built-in hash()
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+class HashRing:
+    """
+    Consistent hash ring: each key maps to the first worker point clockwise
+    from it, so adding or removing a worker only moves that worker's keys.
+    """
+
+    def __init__(self, nodes, replicas=HASH_RING_REPLICAS):
+        self.nodes = sorted(set(nodes))
+        self._points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._keys = [point for point, _ in self._points]
+
+    def owner(self, key: str):
+        if not self._points:
+            return None
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._points)
+        return self._points[i][1]
+
+
+class ShardState:
+    """
+    Poller state shared by all workers in a SQLite database: worker
+    heartbeats and per-video leases, so a video is processed by exactly one
+    worker and a dead worker's leases expire for others to pick up.
+
+    Supported for worker processes on a single host. The database uses the
+    default rollback journal, whose guarantees rest on the filesystem's
+    locks; WAL mode needs shared memory and so only works on one host. Do not
+    put the file on NFS/SMB or other network filesystems unless their
+    byte-range locking is known to be reliable: with broken locks two hosts
+    can both take the same lease.
+    """
+
+    def __init__(self, path=SHARD_STATE_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            # Databases created in WAL mode by earlier versions keep it until reset
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def heartbeat(self, worker_id):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, heartbeat_at) VALUES (?, ?)"
+                " ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (worker_id, time.time()),
+            )
+
+    def remove_worker(self, worker_id):
+        """Drops the worker from the ring and releases its leases (clean shutdown)."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+            conn.execute("DELETE FROM videos WHERE owner = ? AND status = 'leased'", (worker_id,))
+
+    def live_workers(self, ttl=WORKER_TTL) -> list[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT worker_id FROM workers WHERE heartbeat_at >= ?", (time.time() - ttl,))
+            return sorted(row[0] for row in rows)
+
+    def assigned_channels(self, worker_id, channel_ids, ttl=WORKER_TTL) -> list[str]:
+        """The channels this worker owns on the ring of currently live workers."""
+        ring = HashRing(set(self.live_workers(ttl)) | {worker_id})
+        return [channel_id for channel_id in channel_ids if ring.owner(channel_id) == worker_id]
+
+    def try_lease(self, url, worker_id, ttl=LEASE_TTL) -> bool:
+        """
+        Claims (or renews) the lease on `url` for `worker_id`. Fails if the
+        video is done or leased by another worker whose lease has not expired.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO videos (url, status, owner, lease_expires, updated_at) VALUES (?, 'leased', ?, ?, ?)"
+                " ON CONFLICT(url) DO UPDATE SET owner = excluded.owner,"
+                " lease_expires = excluded.lease_expires, updated_at = excluded.updated_at"
+                " WHERE videos.status = 'leased' AND (videos.owner = excluded.owner OR videos.lease_expires < ?)",
+                (url, worker_id, now + ttl, now, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, url, worker_id):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM videos WHERE url = ? AND owner = ? AND status = 'leased'", (url, worker_id))
+
+    def mark_done(self, url, worker_id=None):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO videos (url, status, owner, lease_expires, updated_at) VALUES (?, 'done', ?, NULL, ?)"
+                " ON CONFLICT(url) DO UPDATE SET status = 'done', owner = excluded.owner,"
+                " lease_expires = NULL, updated_at = excluded.updated_at",
+                (url, worker_id, now),
+            )
+
+    def done_urls(self, urls) -> set[str]:
+        """The subset of `urls` already processed by any worker."""
+        urls = list(urls)
+        done = set()
+        with closing(self._connect()) as conn:
+            for i in range(0, len(urls), 500):  # stay under SQLite's bound-parameter limit
+                chunk = urls[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT url FROM videos WHERE status = 'done' AND url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                done.update(row[0] for row in rows)
+        return done
+
+    def import_visited(self, urls):
+        """Seeds the done set from a single-process visited_videos.json."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO videos (url, status, updated_at) VALUES (?, 'done', ?)",
+                [(url, now) for url in urls],
+            )
@@ -1,21 +1,23 @@
 import json
-import os
-import requests
-import time
 import logging
 from dotenv import load_dotenv
+from utils import metrics
+from utils.llm_backends import get_backend
+from utils.schemas import SUMMARY_RESPONSE_FORMAT, SchemaValidationError, parse_summary_response
+from utils.transcript_compaction import TRANSCRIPT_COMPACTION, compact_transcript, compaction_report
 
 load_dotenv()  # Load environment variables from a .env file if present
 
 logger = logging.getLogger(__name__)
 
 FINANCIAL_ANALYST_PROMPT = """
-You are an expert financial analyst. Given the following transcript, identify every company mentioned and for each company return a concise JSON object with three fields: `company_name`, `speaker` and `note`.
+You are an expert financial analyst. Given the following transcript, identify every company mentioned and for each company return a concise JSON object with the fields `company_name`, `speaker`, `note` and `growth_mentions`.
 
 Requirements:
 - `company_name`: Full official company name as mentioned in the transcript (one string).
 - `speaker`: a short string with "Name / Designation" of the person speaking about the company (use the best available name and title from the transcript; if unknown use an empty string).
 - `note`: one short sentence (max 25 words) summarizing what the speaker said about industry growth or the company's outlook (forward-looking comment). If no outlook/growth comment exists, return an empty string.
+- `growth_mentions`: a list of growth mentions as described below (empty list if none).
 
 Transcript:
 \"\"\"
@@ -23,79 +25,91 @@ Transcript:
 \"\"\"
 
  - Detect all mentions of >30% growth in any key metric (revenue, profit, EBITDA, margins, etc.).
+ - `growth_value` must be a plain number (42, not "42%").
  - For each growth mention, if possible, include the approximate **minute mark** in the call 
    (based on textual cues like “earlier”, “later in the call”, or segment order).
    If not inferable, set timestamp_seconds = null.
    
-Return ONLY a JSON array of objects, each object exactly with the keys: `company_name`, `speaker`, `note`.
+Return ONLY a JSON object of the form {{"companies": [...]}}, each company object exactly with the keys: `company_name`, `speaker`, `note`, `growth_mentions`.
 Do NOT include any explanatory text, markdown, or extra fields. Example:
-[
-    {
-        "company_name": "Hindustan Petroleum Corporation Limited",
-        "speaker": "Vikas Sharma / CFO",
-        "note": "Management expects gradual margin recovery over the next two quarters."
-        "growth_mentions": [
-            {
-            "metric": "Revenue",
-            "growth_value": 42,
-            "context": "Revenue grew 42% YoY driven by retail and BFSI segments.",
-            "timestamp_seconds": 480, 
-            "type": "YoY",
-            "reliability": "High"
-            }
-        ]
-    }
-]
+{{
+    "companies": [
+        {{
+            "company_name": "Hindustan Petroleum Corporation Limited",
+            "speaker": "Vikas Sharma / CFO",
+            "note": "Management expects gradual margin recovery over the next two quarters.",
+            "growth_mentions": [
+                {{
+                    "metric": "Revenue",
+                    "growth_value": 42,
+                    "context": "Revenue grew 42% YoY driven by retail and BFSI segments.",
+                    "timestamp_seconds": 480,
+                    "type": "YoY",
+                    "reliability": "High"
+                }}
+            ]
+        }}
+    ]
+}}
 """
 
-def summarise_with_gpt(text, PROMPT_TEMPLATE, api_key=None, model="gpt-5-mini", max_retries=3):
+def summarise_with_gpt(text, PROMPT_TEMPLATE, api_key=None, model=None, max_retries=3, response_format=None):
     """
-    Summarize text using OpenAI GPT API.
+    Summarize text using the configured LLM backend (OpenAI or local Ollama).
+    If `response_format` is given it is passed through to request structured output.
     """
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.error("OPENAI_API_KEY not set")
-        return None
-
     prompt = PROMPT_TEMPLATE.format(text=text)
+    backend = get_backend("summary", api_key=api_key, model=model)
+    return backend.chat(
+        [{"role": "user", "content": prompt}],
+        response_format=response_format,
+        max_retries=max_retries
+    )
+
 
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-    }
+def generate_summary(transcript: str, api_key=None, max_parse_attempts=2, compact=TRANSCRIPT_COMPACTION) -> list[dict]:
+    """
+    Generates a financial summary using the configured LLM backend.
 
-    for attempt in range(max_retries):
+    The transcript is compacted first (caption artifacts, fillers and
+    repeats removed) unless `compact` is False. Requests schema-constrained
+    JSON output, validates it against the company/growth_mentions models
+    and repairs minor formatting issues locally. The summary call is only
+    repeated if the output is still unusable after repair.
+    """
+    if compact:
+        with metrics.timed("transcript_compaction"):
+            compacted = compact_transcript(transcript)
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"].strip()
+            report = compaction_report(transcript, compacted)
+            metrics.inc("summary_input_tokens_saved_total", report["tokens_saved"])
+            logger.info(f"[GPT] Transcript compacted: {report['tokens_before']} -> {report['tokens_after']} "
+                        f"tokens ({report['saved_pct']}% saved, {report['tokenizer']})")
         except Exception as e:
-            logger.warning(f"[GPT] Attempt {attempt + 1} failed: {e}")
-            time.sleep(5)
-    return None
-
+            # The token report is diagnostic only
+            logger.warning(f"[GPT] Could not count transcript tokens: {e}")
+        transcript = compacted
 
-def generate_summary(transcript: str, api_key=None) -> dict:
-    """
-    Generates a financial summary using OpenAI GPT API.
-    """
-    try:
-        response_content = summarise_with_gpt(
-            transcript,
-            FINANCIAL_ANALYST_PROMPT,
-            api_key=api_key,
-            model="gpt-5-mini"
-        )
+    last_error = None
+    for attempt in range(max_parse_attempts):
+        try:
+            with metrics.timed("summary"):
+                response_content = summarise_with_gpt(
+                    transcript,
+                    FINANCIAL_ANALYST_PROMPT,
+                    api_key=api_key,
+                    response_format=SUMMARY_RESPONSE_FORMAT
+                )
+        except Exception as e:
+            raise RuntimeError(f"Error generating summary: {e}")
         if not response_content:
-            raise RuntimeError("No response from OpenAI API.")
-        summary_json = json.loads(response_content)
-        return summary_json
-    except Exception as e:
-        raise RuntimeError(f"Error generating summary: {e}")
\ No newline at end of file
+            raise RuntimeError("Error generating summary: No response from LLM backend.")
+
+        try:
+            return parse_summary_response(response_content)
+        except (json.JSONDecodeError, SchemaValidationError) as e:
+            last_error = e
+            metrics.inc("summary_parse_retries_total")
+            logger.warning(f"[GPT] Summary output invalid on attempt {attempt + 1}: {e}")
+
+    raise RuntimeError(f"Error generating summary: invalid JSON output ({last_error})")
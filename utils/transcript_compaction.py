@@ -0,0 +1,133 @@
+import os
+import re
+import sys
+import json
+import logging
+
+# Compacts auto-generated caption text before it is sent to the summary LLM:
+# caption markers, disfluencies and stuttered repeats carry no information
+# but cost input tokens (latency and money) on every summary call.
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_COMPACTION = os.getenv("TRANSCRIPT_COMPACTION", "1") != "0"
+# If > 0, only keep this many words either side of numeric/financial content
+# (plus the opening, where speakers and companies are introduced)
+NUMERIC_WINDOW_WORDS = int(os.getenv("TRANSCRIPT_NUMERIC_WINDOW", "0"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+
+FILLER_PHRASES = ["uh+", "um+", "umm+", "erm", "ah+", "hmm+", "you know", "i mean", "basically"]
+
+_ARTIFACT_RE = re.compile(
+    r"\[[^\]]*\]|\((?:[^)]*\b(?:music|applause|laughter|inaudible|crosstalk)\b[^)]*)\)|&gt;&gt;|>>|♪+",
+    re.IGNORECASE,
+)
+# "do you know" / "did you know" are questions, not filler
+_FILLER_RE = re.compile(
+    r"(?<!\bdo )(?<!\bdid )(?<!\bdon't )(?:,\s*)?\b(?:" + "|".join(FILLER_PHRASES) + r")\b,?",
+    re.IGNORECASE,
+)
+_FINANCIAL_UNITS = r"percent|per|cent|crores?|lakhs?|billions?|millions?|bps|basis|points?"
+# "the the", "I think I think", "we are we are we are": immediate 1-3 word
+# stutters. Numbers and units are never collapsed ("100 crore, 100 crore").
+_REPEAT_WORD = rf"(?!(?:{_FINANCIAL_UNITS})\b)[^\W\d_]+"
+_REPEAT_RE = re.compile(rf"\b({_REPEAT_WORD}(?:\s+{_REPEAT_WORD}){{0,2}})(?:\s+\1\b)+", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,.?!;:])")
+_DUPLICATE_PUNCT_RE = re.compile(r"([,.?!;:])(?:\s*[,;:])+")
+_NUMERIC_WORD_RE = re.compile(r"\d|percent|crore|lakh|billion|million|bps|basis", re.IGNORECASE)
+
+
+def normalize_transcript(text: str) -> str:
+    """Removes caption artifacts and disfluencies and collapses stuttered repeats."""
+    text = _ARTIFACT_RE.sub(" ", text)
+    text = _FILLER_RE.sub(" ", text)
+    text = _REPEAT_RE.sub(r"\1", text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)
+    text = _DUPLICATE_PUNCT_RE.sub(r"\1", text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    return text.lstrip(",;: ")
+
+
+def keep_numeric_windows(text: str, window_words: int) -> str:
+    """
+    Keeps the opening `window_words` words plus `window_words` words either
+    side of every number or financial unit; dropped stretches become "...".
+    """
+    words = text.split()
+    keep = [False] * len(words)
+    for i in range(min(window_words, len(words))):
+        keep[i] = True
+    for i, word in enumerate(words):
+        if _NUMERIC_WORD_RE.search(word):
+            for j in range(max(0, i - window_words), min(len(words), i + window_words + 1)):
+                keep[j] = True
+
+    parts = []
+    for word, kept in zip(words, keep):
+        if kept:
+            parts.append(word)
+        elif not parts or parts[-1] != "...":
+            parts.append("...")
+    return " ".join(parts)
+
+
+def compact_transcript(text: str, numeric_window=NUMERIC_WINDOW_WORDS) -> str:
+    """Normalized transcript, optionally reduced to windows around numeric content."""
+    text = normalize_transcript(text)
+    if numeric_window and numeric_window > 0:
+        text = keep_numeric_windows(text, numeric_window)
+    return text
+
+
+_encoder = None
+
+def count_tokens(text: str) -> tuple[int, str]:
+    """
+    Returns `(token_count, tokenizer)`. Uses tiktoken when installed and its
+    encoding is available, otherwise an approximation of 4 characters per
+    token. Never raises: the count is only used for reporting.
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            # Downloads the encoding on first use, which fails on offline hosts
+            _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:
+            logger.info(f"[compaction] tiktoken unavailable ({e}); using approximate token counts")
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text, disallowed_special=())), TOKENIZER_ENCODING
+    return (len(text) + 3) // 4, "approx"
+
+
+def compaction_report(original: str, compacted: str) -> dict:
+    """Token counts before/after compaction and the tokens saved."""
+    before, tokenizer = count_tokens(original)
+    after, _ = count_tokens(compacted)
+    return {
+        "tokenizer": tokenizer,
+        "tokens_before": before,
+        "tokens_after": after,
+        "tokens_saved": before - after,
+        "saved_pct": round(100 * (before - after) / before, 1) if before else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.transcript_compaction <transcript.txt | segments.json | youtube_url> [numeric_window]
+    source = sys.argv[1]
+    window = int(sys.argv[2]) if len(sys.argv) > 2 else NUMERIC_WINDOW_WORDS
+    if source.startswith("http"):
+        from utils.transcription import get_transcript
+        text = get_transcript(source)
+    elif source.endswith(".json"):
+        with open(source, "r") as f:
+            text = " ".join(seg["text"] for seg in json.load(f))
+    else:
+        with open(source, "r") as f:
+            text = f.read()
+    compacted = compact_transcript(text, numeric_window=window)
+    print(compacted)
+    print(json.dumps(compaction_report(text, compacted), indent=2), file=sys.stderr)
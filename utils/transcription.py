@@ -1,9 +1,71 @@
-import streamlit as st
-import yt_dlp
-import whisper
 import os
 import re
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
+import json
+import logging
+import tempfile
+import threading
+from utils import metrics
+
+# yt_dlp, whisper (torch) and youtube_transcript_api are imported on the code
+# path that needs them; caption-only runs never load torch. This module has no
+# UI dependency: callers pass an `on_event(event, message)` callback for
+# progress/warnings and a cache object for storing transcripts.
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+
+
+class MemoryTranscriptCache:
+    """In-process transcript cache keyed by video ID."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, video_id):
+        with self._lock:
+            return self._data.get(video_id)
+
+    def set(self, video_id, segments):
+        with self._lock:
+            self._data[video_id] = segments
+
+
+class DiskTranscriptCache:
+    """
+    Stores each transcript as `<directory>/<video_id>.json`, so it survives
+    restarts and can be shared between worker processes.
+    """
+
+    def __init__(self, directory=".transcript_cache"):
+        self.directory = directory
+
+    def _path(self, video_id):
+        return os.path.join(self.directory, f"{video_id}.json")
+
+    def get(self, video_id):
+        try:
+            with open(self._path(video_id), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, video_id, segments):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{self._path(video_id)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(segments, f)
+        os.replace(tmp_path, self._path(video_id))
+
+
+_default_cache = MemoryTranscriptCache()
+
+
+def _log_event(event, message):
+    logger.info(f"[transcription] {event}: {message}")
+
 
 def extract_video_id(url):
     """Extracts the YouTube video ID from a URL."""
@@ -14,52 +76,108 @@ def extract_video_id(url):
         return match.group(0)
     return None
 
-@st.cache_data
-def get_transcript(video_url: str) -> str:
+def fetch_caption_segments(video_id: str) -> list[dict]:
+    """
+    Fetches the YouTube caption track as `{"text": ..., "start": ...}` segments.
+    Raises youtube_transcript_api errors (e.g. TranscriptsDisabled) if unavailable.
     """
-    Retrieves the transcript for a YouTube video using a hybrid approach.
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    with metrics.timed("caption_fetch"):
+        # This is the updated, correct method call. It directly fetches the
+        # transcript in the specified languages.
+        ytt_api = YouTubeTranscriptApi()
+        transcript_data = ytt_api.fetch(video_id, languages=['en'])
+    if hasattr(transcript_data, "to_raw_data"):
+        transcript_data = transcript_data.to_raw_data()
+    return [{'text': d['text'], 'start': d['start']} for d in transcript_data]
+
+_whisper_models = {}
+
+def _load_whisper_model(name):
+    """Loads a Whisper model once per process."""
+    if name not in _whisper_models:
+        import whisper
+        _whisper_models[name] = whisper.load_model(name)
+    return _whisper_models[name]
+
+def transcribe_with_whisper(video_url: str, on_event=_log_event, model_name=WHISPER_MODEL) -> list[dict]:
+    """Downloads the audio with yt-dlp and transcribes it with Whisper into segments."""
+    on_event("audio_download", "Downloading audio...")
+    with metrics.timed("audio_download"):
+        audio_file = download_audio(video_url)
+
+    try:
+        on_event("whisper_transcribe", "Transcribing audio with Whisper...")
+        with metrics.timed("whisper"):
+            # Using the "base" model by default for a balance of speed and accuracy.
+            # For higher accuracy, "small" or "medium" can be used, but they are slower.
+            model = _load_whisper_model(model_name)
+            result = model.transcribe(audio_file)
+    finally:
+        # Clean up the downloaded audio file
+        if os.path.exists(audio_file):
+            os.remove(audio_file)
+
+    return [{'text': seg['text'].strip(), 'start': seg['start']} for seg in result['segments']]
+
+def get_transcript_segments(video_url: str, on_event=_log_event, cache=None) -> list[dict]:
+    """
+    Retrieves the timestamped transcript for a YouTube video as a list of
+    `{"text": ..., "start": ...}` segments, using a hybrid approach.
     First, it tries the youtube_transcript_api. If that fails, it falls back
     to downloading the audio with yt-dlp and transcribing with Whisper.
+
+    `on_event(event, message)` receives progress and warnings
+    ("captions_unavailable", "audio_download", "whisper_transcribe");
+    `cache` is any object with `get(video_id)` / `set(video_id, segments)`.
     """
+    from youtube_transcript_api import TranscriptsDisabled
+
     video_id = extract_video_id(video_url)
     if not video_id:
         raise ValueError("Invalid YouTube URL provided.")
 
+    cache = _default_cache if cache is None else cache
+    cached = cache.get(video_id)
+    metrics.record_cache("transcript", cached is not None)
+    if cached is not None:
+        return cached
+
     # --- Method 1: Try youtube_transcript_api (fast and cheap) ---
     try:
-        # This is the updated, correct method call. It directly fetches the
-        # transcript in the specified languages.
-        ytt_api = YouTubeTranscriptApi()
-        transcript_data = ytt_api.fetch(video_id, languages=['en'])
-        transcript_text = " ".join([d['text'] for d in transcript_data])
-        return transcript_text
+        segments = fetch_caption_segments(video_id)
+        metrics.inc("transcript_source_total", source="captions")
+        cache.set(video_id, segments)
+        return segments
     except TranscriptsDisabled:
-        st.warning("Transcripts are disabled for this video. Falling back to audio transcription. This may take a few minutes.")
+        on_event("captions_unavailable", "Transcripts are disabled for this video. Falling back to audio transcription. This may take a few minutes.")
     except Exception as e:
-        st.warning(f"Could not retrieve transcript with first method ({e}). Falling back to audio transcription.")
+        on_event("captions_unavailable", f"Could not retrieve transcript with first method ({e}). Falling back to audio transcription.")
 
     # --- Method 2: Fallback to yt-dlp and Whisper (robust) ---
     try:
-        audio_file = download_audio(video_url)
-        
-        # Load whisper model
-        # Using the "base" model for a balance of speed and accuracy.
-        # For higher accuracy, "small" or "medium" can be used, but they are slower.
-        model = whisper.load_model("base")
-        
-        # Transcribe the audio
-        result = model.transcribe(audio_file)
-        transcript_text = result['text']
-        
-        # Clean up the downloaded audio file
-        os.remove(audio_file)
-        
-        return transcript_text
+        segments = transcribe_with_whisper(video_url, on_event=on_event)
     except Exception as e:
         raise RuntimeError(f"Failed to transcribe audio: {e}")
 
-def download_audio(url: str) -> str:
-    """Downloads the audio from a YouTube URL and returns the file path."""
+    metrics.inc("transcript_source_total", source="whisper")
+    cache.set(video_id, segments)
+    return segments
+
+def get_transcript(video_url: str, on_event=_log_event, cache=None) -> str:
+    """Retrieves the transcript for a YouTube video as plain text."""
+    return " ".join(seg['text'] for seg in get_transcript_segments(video_url, on_event=on_event, cache=cache))
+
+def download_audio(url: str, output_dir=None) -> str:
+    """
+    Downloads the audio from a YouTube URL and returns the file path.
+    Files are named by video ID so concurrent downloads don't collide.
+    """
+    import yt_dlp
+
+    output_dir = output_dir or tempfile.gettempdir()
+    base_path = os.path.join(output_dir, f"audio_{extract_video_id(url) or os.getpid()}")
     ydl_opts = {
         'format': '140',
         'postprocessors': [{
@@ -67,9 +185,9 @@ def download_audio(url: str) -> str:
             'preferredcodec': 'mp3',
             'preferredquality': '192',
         }],
-        'outtmpl': 'downloaded_audio.%(ext)s',
+        'outtmpl': f'{base_path}.%(ext)s',
         'quiet': True,
     }
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         ydl.download([url])
-    return "downloaded_audio.mp3"
\ No newline at end of file
+    return f"{base_path}.mp3"